@@ -0,0 +1,171 @@
+# backend/benchmarks/fakes.py
+"""
+Local stand-ins for every external service the backend talks to: the GitHub
+REST and GraphQL APIs, the Google Docs export and an OpenAI-compatible LLM.
+They are ASGI apps mounted in-process with httpx.ASGITransport, so the real
+services run unchanged, fully offline and without opening ports.
+"""
+
+import json
+from typing import Dict
+
+import httpx
+from fastapi import FastAPI, Request, Response
+
+from ..services.gdocs_service import GoogleDocsService
+from ..services.github_service import GITHUB_API_URL
+from ..services.http_clients import http_clients
+from ..services.llm_providers import DEEPSEEK_BASE_URL
+from ..services.mock_llm import create_mock_llm_app
+from .gdocs_parser_benchmark import build_corpus
+
+_README_TEMPLATE = """# {name}
+
+[![Build](https://img.shields.io/badge/build-passing-green.svg)](https://ci.example.com)
+
+{name} is a {kind} written in {language} that {purpose}. It is used by
+several teams in production and focuses on predictable performance.
+
+## Features
+
+- Incremental processing with bounded memory
+- Pluggable storage backends
+- First-class observability
+
+## Installation
+
+```bash
+pip install {name}
+```
+
+## License
+
+MIT
+"""
+_KINDS = ("command line tool", "web service", "library", "data pipeline", "browser extension")
+_LANGUAGES = ("Python", "TypeScript", "Go", "Rust", "Java")
+_PURPOSES = (
+    "turns raw event logs into searchable dashboards",
+    "synchronises calendars across providers",
+    "generates typed API clients from OpenAPI specs",
+    "schedules background jobs with retries",
+    "compresses images without visible quality loss",
+)
+
+
+def fake_readme(name: str, padding: int = 0) -> str:
+    """Deterministic README for a repo name, plus `padding` extra characters of prose"""
+    seed = sum(map(ord, name))
+    readme = _README_TEMPLATE.format(
+        name=name,
+        kind=_KINDS[seed % len(_KINDS)],
+        language=_LANGUAGES[seed % len(_LANGUAGES)],
+        purpose=_PURPOSES[seed % len(_PURPOSES)],
+    )
+    if padding:
+        filler = "Further design notes describe the internals in detail. "
+        readme += "\n## Design notes\n\n" + filler * (padding // len(filler) + 1)
+    return readme
+
+
+def fake_repo(owner: str, index: int) -> Dict:
+    name = f"project-{index}"
+    return {
+        "id": index,
+        "node_id": f"R_{index}",
+        "name": name,
+        "full_name": f"{owner}/{name}",
+        "private": index % 5 == 0,
+        "owner": {"login": owner, "id": 1},
+        "html_url": f"https://github.com/{owner}/{name}",
+        "description": None if index % 3 == 0 else f"Project number {index}",
+        "fork": False,
+        "url": f"https://api.github.com/repos/{owner}/{name}",
+        "homepage": None,
+        "language": _LANGUAGES[index % len(_LANGUAGES)],
+        "topics": ["benchmark"],
+        "stargazers_count": index * 3,
+        "forks_count": index,
+        "pushed_at": "2025-01-01T00:00:00Z",
+        "updated_at": "2025-01-01T00:00:00Z",
+        "created_at": "2024-01-01T00:00:00Z",
+        "default_branch": "main",
+        "visibility": "private" if index % 5 == 0 else "public",
+    }
+
+
+def create_fake_github_app(repo_count: int = 300, readme_padding: int = 2000, owner: str = "bench") -> FastAPI:
+    """GitHub REST (user, repo list, README) and the GraphQL details query"""
+    app = FastAPI(title="Fake GitHub")
+
+    @app.get("/user")
+    async def user():
+        return {"login": owner, "id": 1, "name": "Bench User"}
+
+    @app.get("/user/repos")
+    async def repos(request: Request, page: int = 1, per_page: int = 30):
+        last = max((repo_count + per_page - 1) // per_page, 1)
+        items = [fake_repo(owner, i) for i in range((page - 1) * per_page, min(page * per_page, repo_count))]
+        base = f"{GITHUB_API_URL}/user/repos?per_page={per_page}"
+        links = []
+        if page < last:
+            links.append(f'<{base}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}&page={last}>; rel="last"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        return Response(json.dumps(items), media_type="application/json", headers=headers)
+
+    @app.get("/repos/{repo_owner}/{name}/readme")
+    async def readme(repo_owner: str, name: str):
+        return Response(fake_readme(name, readme_padding), media_type="text/plain")
+
+    @app.post("/graphql")
+    async def graphql(body: dict):
+        variables = body.get("variables") or {}
+        data = {}
+        for key, name in variables.items():
+            if not key.startswith("name"):
+                continue
+            index = key[len("name"):]
+            repo = {
+                "description": None,
+                "primaryLanguage": {"name": "Python"},
+                "repositoryTopics": {"nodes": [{"topic": {"name": "benchmark"}}]},
+                "readme0": {"oid": f"sha-{name}", "text": fake_readme(name, readme_padding), "isBinary": False},
+            }
+            data[f"repo{index}"] = repo
+        return {"data": data}
+
+    return app
+
+
+def create_fake_gdocs_app(pages: int = 5) -> FastAPI:
+    """The public plain text export, serving the same scaled CV for every doc id"""
+    app = FastAPI(title="Fake Google Docs")
+    corpus = build_corpus(pages)
+
+    @app.get("/document/d/{doc_id}/export")
+    async def export(doc_id: str, format: str = "txt"):
+        return Response(corpus, media_type="text/plain; charset=utf-8")
+
+    return app
+
+
+def install_fakes(
+    repo_count: int = 300,
+    readme_padding: int = 2000,
+    doc_pages: int = 5,
+    llm_latency: float = 0.05,
+    llm_jitter: float = 0.02,
+    llm_error_rate: float = 0.0,
+    seed: int = 0,
+):
+    """Route the shared HTTP clients for GitHub, Google Docs and DeepSeek to the fakes"""
+    apps = {
+        GITHUB_API_URL: create_fake_github_app(repo_count, readme_padding),
+        GoogleDocsService.export_url("any"): create_fake_gdocs_app(doc_pages),
+        DEEPSEEK_BASE_URL: create_mock_llm_app(
+            latency=llm_latency, jitter=llm_jitter, error_rate=llm_error_rate, seed=seed
+        ),
+    }
+    for url, app in apps.items():
+        http_clients.override(url, httpx.AsyncClient(transport=httpx.ASGITransport(app=app)))
@@ -0,0 +1,92 @@
+# backend/benchmarks/gdocs_parser_benchmark.py
+"""
+Throughput of the Google Docs CV parser on large exports.
+
+The corpus is corpus/sample_cv.txt with its education, experience and skills
+entries repeated until the document reaches the requested number of pages
+(about 50 lines per page), which is what very long academic CVs look like.
+
+    python -m backend.benchmarks.gdocs_parser_benchmark --pages 500
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Iterator
+
+from ..services.gdocs_service import CVParser, GoogleDocsService
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+LINES_PER_PAGE = 50
+
+
+def build_corpus(pages: int, sample: str = os.path.join(CORPUS_DIR, "sample_cv.txt")) -> str:
+    """Scale the sample CV up to roughly `pages` pages"""
+    with open(sample, encoding="utf-8") as f:
+        blocks = f.read().strip().split("\n\n")
+    personal, body = blocks[0], blocks[1:]
+    lines = personal.count("\n") + 1
+    parts = [personal]
+    repeat = 0
+    while lines < pages * LINES_PER_PAGE:
+        repeat += 1
+        for block in body:
+            header, *items = block.split("\n")
+            parts.append("\n".join([header] + [item.replace("|", f"({repeat}) |", 1) for item in items]))
+            lines += len(items) + 2
+    return "\n\n".join(parts) + "\n"
+
+
+def _chunks(content: str, size: int = 64 * 1024) -> Iterator[str]:
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+async def _stream_lines(content: str) -> AsyncIterator[str]:
+    # Re-splits fixed-size chunks into lines the way httpx's aiter_lines does
+    pending = ""
+    for chunk in _chunks(content):
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def _parse_streaming(content: str):
+    parser = CVParser()
+    async for line in _stream_lines(content):
+        parser.feed(line)
+    return parser.result()
+
+
+def run(pages: int, rounds: int):
+    content = build_corpus(pages)
+    size_mb = len(content.encode("utf-8")) / 1e6
+    line_count = content.count("\n")
+    print(f"Corpus: {pages} pages, {line_count} lines, {size_mb:.2f} MB")
+
+    for name, parse in (
+        ("parse_cv_content", lambda: GoogleDocsService.parse_cv_content(content)),
+        ("streaming", lambda: asyncio.run(_parse_streaming(content))),
+    ):
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = parse()
+            best = min(best, time.perf_counter() - start)
+        items = sum(len(section["items"]) for section in result["sections"])
+        print(
+            f"{name:>17}: {best * 1000:8.1f} ms  {line_count / best:12,.0f} lines/s  "
+            f"{size_mb / best:7.1f} MB/s  ({len(result['sections'])} sections, {items} items)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.pages, args.rounds)
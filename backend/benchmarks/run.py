@@ -0,0 +1,430 @@
+# backend/benchmarks/run.py
+"""
+Offline benchmark and load test for the backend endpoints.
+
+The real app is driven in-process through httpx.ASGITransport while GitHub,
+the Google Docs export and the LLM are served by the local fakes in
+fakes.py. Each scenario reports latency percentiles, throughput at the given
+concurrency, errors and peak memory (of the whole process tree, render pool
+workers included); PDF render time is also measured per template. Results
+are written as JSON and can be compared with a baseline:
+
+    python -m backend.benchmarks.run --out bench.json
+    python -m backend.benchmarks.run --save-baseline            # record backend/benchmarks/baseline.json
+    python -m backend.benchmarks.run --baseline backend/benchmarks/baseline.json --fail-on-regression
+
+Numbers are only comparable between runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from .fakes import install_fakes
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+
+# Metric -> True when higher is better; used for baseline comparisons
+COMPARED_METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+    "peak_rss_mb": False,
+}
+
+SAMPLE_RESUME = {
+    "user_details": {
+        "name": "Bench User",
+        "job_title": "Software Engineer",
+        "email": "bench@example.com",
+        "phone": "+1 555 0100",
+        "linkedin": "https://linkedin.com/in/bench",
+        "github_username": "bench",
+    },
+    "sections": [
+        {
+            "id": "sec_1",
+            "title": "Projects",
+            "items": [
+                {
+                    "id": f"item_{i}",
+                    "primary": f"project-{i}",
+                    "secondary": "Python, FastAPI",
+                    "timeline": "2024",
+                    "description": "Service that turns raw event logs into searchable dashboards. " * 3,
+                }
+                for i in range(8)
+            ],
+        },
+        {
+            "id": "sec_2",
+            "title": "Employment History",
+            "items": [
+                {
+                    "id": f"job_{i}",
+                    "primary": f"Company {i}",
+                    "secondary": "Engineer",
+                    "timeline": f"{2015 + i}-{2016 + i}",
+                    "description": "Built and operated data pipelines processing terabytes a day.",
+                }
+                for i in range(4)
+            ],
+        },
+    ],
+}
+
+
+def _descendants(pid: int) -> List[int]:
+    """Every live process below `pid`, from the parent links in /proc"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after its ')'
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue  # Exited while we were looking
+        children.setdefault(ppid, []).append(int(entry))
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def _rss_mb() -> float:
+    """
+    Current resident set size of this process plus its children, so the
+    PDF render pool workers are counted too
+    """
+    try:
+        total = 0
+        for pid in [os.getpid()] + _descendants(os.getpid()):
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1])
+            except OSError:
+                continue  # A worker exited (e.g. recycled) in the meantime
+        return total * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        # Not Linux: fall back to lifetime peaks (KB on Linux, bytes on macOS).
+        # Children only count once they have exited, so workers still
+        # running are missed here.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, peak_rss: float, base_rss: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    completed = len(latencies)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(ordered, 0.90) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        "mean_ms": round(sum(ordered) / completed * 1000, 2) if completed else 0.0,
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "peak_rss_mb": round(peak_rss, 1),
+        "rss_growth_mb": round(peak_rss - base_rss, 1),
+    }
+
+
+async def run_load(
+    call: Callable[[int], Awaitable[bool]],
+    requests: int,
+    concurrency: int,
+    warmup: int = 2,
+) -> Dict[str, Any]:
+    """
+    Run `call(i)` for i in range(requests) with `concurrency` workers and
+    summarize it. `call` returns False (or raises) for a failed request.
+    Warm-up calls run first, sequentially, and are not measured.
+    """
+    for i in range(warmup):
+        with contextlib.suppress(Exception):
+            await call(-1 - i)
+
+    latencies: List[float] = []
+    errors = 0
+    next_index = iter(range(requests))
+    base_rss = peak_rss = _rss_mb()
+    sampling = True
+
+    async def sample_memory():
+        nonlocal peak_rss
+        while sampling:
+            peak_rss = max(peak_rss, _rss_mb())
+            await asyncio.sleep(0.05)
+
+    async def worker():
+        nonlocal errors
+        for i in next_index:
+            start = time.perf_counter()
+            try:
+                ok = await call(i)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    sampler = asyncio.create_task(sample_memory())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    sampling = False
+    await sampler
+    peak_rss = max(peak_rss, _rss_mb())
+    return summarize(latencies, errors, elapsed, peak_rss, base_rss)
+
+
+def _scenarios(client: httpx.AsyncClient, args) -> Dict[str, Callable[[int], Awaitable[bool]]]:
+    """Scenario name -> one request. Indexed inputs keep caches cold unless the name says warm."""
+    github_auth = {"Authorization": "token bench"}
+
+    async def fetch_repos(i: int) -> bool:
+        response = await client.get("/api/fetch_repos", params={"fields": "resume"}, headers=github_auth)
+        return response.status_code == 200 and len(response.json()) == args.repos
+
+    async def enhance_repos(i: int) -> bool:
+        # Fresh repo names every call, so neither GitHub nor description caches help
+        repos = [
+            {"name": f"r{i}-{j}", "full_name": f"bench/r{i}-{j}", "description": None}
+            for j in range(args.enhance_repos)
+        ]
+        response = await client.post(
+            "/api/enhance_repos",
+            json={"repos": repos, "deepseek_api_key": "bench-key"},
+            headers=github_auth,
+        )
+        return response.status_code == 200 and response.headers.get("X-Enhancement-Incomplete") == "0"
+
+    async def parse_google_doc_cold(i: int) -> bool:
+        response = await client.post(
+            "/api/parse_google_doc", json={"doc_url": f"https://docs.google.com/document/d/bench-cold-{i}/edit"}
+        )
+        return response.status_code == 200
+
+    async def parse_google_doc_warm(i: int) -> bool:
+        response = await client.post(
+            "/api/parse_google_doc", json={"doc_url": "https://docs.google.com/document/d/bench-warm/edit"}
+        )
+        return response.status_code == 200
+
+    def generate_resume(warm: bool):
+        async def call(i: int) -> bool:
+            data = {**SAMPLE_RESUME, "template": args.templates[0]}
+            if not warm:
+                data["user_details"] = {**data["user_details"], "name": f"Bench User {i}"}
+            response = await client.post("/api/generate_resume", json=data)
+            return response.status_code == 200 and response.headers.get("content-type") == "application/pdf"
+        return call
+
+    return {
+        "fetch_repos": fetch_repos,
+        "enhance_repos": enhance_repos,
+        "parse_google_doc_cold": parse_google_doc_cold,
+        "parse_google_doc_warm": parse_google_doc_warm,
+        "generate_resume_cold": generate_resume(warm=False),
+        "generate_resume_warm": generate_resume(warm=True),
+    }
+
+
+def measure_render_per_template(templates: List[str], rounds: int) -> Dict[str, Any]:
+    """Time HTML rendering and PDF rendering of the sample resume, in this process, per template"""
+    from ..services.render_service import render_html, render_pdf
+
+    results = {}
+    for template in templates:
+        data = {**SAMPLE_RESUME, "template": template}
+        try:
+            render_pdf(render_html(data))  # First render loads fonts and compiles the template
+            html_times, pdf_times, size = [], [], 0
+            for _ in range(rounds):
+                start = time.perf_counter()
+                html = render_html(data)
+                html_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                size = len(render_pdf(html))
+                pdf_times.append(time.perf_counter() - start)
+        except Exception as e:
+            results[template] = {"error": repr(e)}
+            continue
+        pdf_times.sort()
+        results[template] = {
+            "html_ms": round(sorted(html_times)[len(html_times) // 2] * 1000, 2),
+            "p50_ms": round(percentile(pdf_times, 0.5) * 1000, 2),
+            "p95_ms": round(percentile(pdf_times, 0.95) * 1000, 2),
+            "pdf_bytes": size,
+        }
+    return results
+
+
+async def run_benchmarks(args) -> Dict[str, Any]:
+    install_fakes(
+        repo_count=args.repos,
+        doc_pages=args.doc_pages,
+        llm_latency=args.llm_latency,
+        llm_jitter=args.llm_jitter,
+        llm_error_rate=args.llm_error_rate,
+        seed=args.seed,
+    )
+    from ..main import app
+
+    if args.quiet:
+        # The app logs every request; keep that out of the report
+        logging.getLogger("backend").setLevel(logging.WARNING)
+
+    results: Dict[str, Any] = {}
+    # The app's own lifespan starts (and stops) the render pool, as in production
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            scenarios = _scenarios(client, args)
+            for name in args.scenarios:
+                requests = args.enhance_requests if name == "enhance_repos" else args.requests
+                print(f"→ {name}: {requests} requests, concurrency {args.concurrency}", file=sys.stderr)
+                results[name] = await run_load(scenarios[name], requests, args.concurrency)
+                results[name]["concurrency"] = args.concurrency
+
+    if args.render_rounds:
+        print(f"→ render time per template: {args.render_rounds} rounds", file=sys.stderr)
+        results["render_per_template"] = measure_render_per_template(args.templates, args.render_rounds)
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Every compared metric that got worse than the baseline by more than `tolerance`"""
+    regressions = []
+    for scenario, metrics in results.get("scenarios", {}).items():
+        reference = baseline.get("scenarios", {}).get(scenario)
+        if not isinstance(reference, dict) or "error" in metrics:
+            continue
+        if scenario == "render_per_template":
+            pairs = [(f"{scenario}.{template}", values, reference.get(template) or {})
+                     for template, values in metrics.items()]
+        else:
+            pairs = [(scenario, metrics, reference)]
+        for label, current, previous in pairs:
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                now, before = current.get(metric), previous.get(metric)
+                if not isinstance(now, (int, float)) or not isinstance(before, (int, float)) or not before:
+                    continue
+                change = (now - before) / before
+                if (change < -tolerance) if higher_is_better else (change > tolerance):
+                    regressions.append({
+                        "scenario": label, "metric": metric, "baseline": before, "current": now,
+                        "change_pct": round(change * 100, 1),
+                    })
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'scenario':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'errors':>8}{'peak MB':>10}")
+    for name, metrics in report["scenarios"].items():
+        if name == "render_per_template":
+            continue
+        print(
+            f"{name:<24}{metrics['p50_ms']:>10}{metrics['p95_ms']:>10}{metrics['p99_ms']:>10}"
+            f"{metrics['throughput_rps']:>10}{metrics['errors']:>8}{metrics['peak_rss_mb']:>10}"
+        )
+    for template, metrics in report["scenarios"].get("render_per_template", {}).items():
+        if "error" in metrics:
+            print(f"render {template:<17} ✗ {metrics['error']}")
+        else:
+            print(f"render {template:<17}{metrics['p50_ms']:>10}{metrics['p95_ms']:>10}   ({metrics['pdf_bytes']} bytes)")
+    for regression in report.get("regressions", []):
+        print(
+            f"✗ {regression['scenario']} {regression['metric']}: {regression['baseline']} -> "
+            f"{regression['current']} ({regression['change_pct']:+}%)"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..services.render_service import TEMPLATES_DIR
+
+    default_templates = sorted(name[:-5] for name in os.listdir(TEMPLATES_DIR) if name.endswith(".html"))
+    all_scenarios = ["fetch_repos", "enhance_repos", "parse_google_doc_cold", "parse_google_doc_warm",
+                     "generate_resume_cold", "generate_resume_warm"]
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=all_scenarios, default=all_scenarios)
+    parser.add_argument("--requests", type=int, default=50, help="requests per scenario")
+    parser.add_argument("--enhance-requests", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repos", type=int, default=300, help="repos the fake GitHub account owns")
+    parser.add_argument("--enhance-repos", type=int, default=30, help="repos per /enhance_repos call")
+    parser.add_argument("--doc-pages", type=int, default=5, help="size of the fake Google Doc")
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--llm-jitter", type=float, default=0.02)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--templates", nargs="+", default=default_templates)
+    parser.add_argument("--render-rounds", type=int, default=5, help="0 skips the per-template render timing")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against this report")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--verbose", dest="quiet", action="store_false", help="keep the app's own logging")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": {key: value for key, value in vars(args).items()
+                       if key not in ("out", "baseline", "save_baseline", "fail_on_regression", "quiet")},
+        },
+        "scenarios": asyncio.run(run_benchmarks(args)),
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline"] = args.baseline
+        report["regressions"] = compare(report, baseline, args.tolerance)
+        ignored = ("scenarios",)
+        current_config = {k: v for k, v in report["meta"]["config"].items() if k not in ignored}
+        baseline_config = {k: v for k, v in baseline.get("meta", {}).get("config", {}).items() if k not in ignored}
+        if current_config != baseline_config:
+            print("⚠ Baseline was recorded with different settings; the comparison is not like for like", file=sys.stderr)
+
+    print_report(report)
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Report written to {path}")
+    return 1 if args.fail_on_regression and report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,44 @@
 # backend/main.py
 
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware  # <-- 1. IMPORT THIS
 from .routes import github, resume
+from .services.llm_service import DeepSeekService
+from .services.job_service import job_manager
+from .services.render_service import render_pool
+from .services.http_clients import http_clients
+from .services.llm_providers import provider_stats
+from .services.logging_config import configure_logging
+from .services.metrics import http_request_seconds, register_service_collectors, registry
+
+configure_logging()
+register_service_collectors()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifetime hooks. The PDF render pool is warmed up on startup;
+    shared, pooled clients are created lazily and closed here on shutdown.
+    """
+    render_pool.start()
+    yield
+    render_pool.shutdown()
+    await job_manager.shutdown()
+    DeepSeekService.reset_pool()
+    await http_clients.aclose()
+
 
 # Create an instance of the FastAPI class
 app = FastAPI(
     title="GitHub Resume Sync API",
     description="Backend service for the GitHub Resume Sync browser extension.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # --- 2. DEFINE YOUR ORIGINS AND ADD THE MIDDLEWARE (ADD THIS ENTIRE BLOCK) ---
@@ -26,6 +56,30 @@ app.add_middleware(
 # --- END OF THE NEW BLOCK ---
 
 
+def _route_label(request: Request) -> str:
+    """The matched route template, e.g. /api/enhance_jobs/{job_id}"""
+    route = request.scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # The route template, not the raw path, keeps the label set small
+        http_request_seconds.observe(
+            time.perf_counter() - start,
+            route=_route_label(request),
+            method=request.method,
+            status=str(status),
+        )
+
+
 # A simple root endpoint to verify that the server is running correctly.
 @app.get("/")
 def read_root():
@@ -35,6 +89,33 @@ def read_root():
     return {"message": "Welcome to the GitHub Resume Sync Backend!"}
 
 
+@app.get("/stats/http_pools")
+def http_pool_stats():
+    """
+    Utilisation of the shared outbound HTTP connection pools, per host.
+    """
+    return http_clients.stats()
+
+
+@app.get("/stats/llm_providers")
+def llm_provider_stats():
+    """
+    Routing view of the LLM providers: moving-average latency, error rate
+    and hedging counts.
+    """
+    return {name: stats.as_dict() for name, stats in provider_stats.items()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus metrics: per-stage timings (GitHub fetch, README fetch, LLM
+    call, Jinja render, WeasyPrint layout, PDF write), request latency,
+    cache hit rates, connection pool utilisation and render queue depth.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include the routers
 app.include_router(
     github.router,
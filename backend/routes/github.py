@@ -1,23 +1,50 @@
-from fastapi import APIRouter, HTTPException, Header, Body
-import httpx
+from fastapi import APIRouter, HTTPException, Header, Body, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
+import json
+import logging
 from pydantic import BaseModel
 from ..services.llm_service import DeepSeekService
+from ..services.enhancement_service import enhance_user_repos, count_incomplete
+from ..services.github_rate_limiter import GitHubRateLimited
+from ..services.job_service import job_manager
 from ..services.gdocs_service import GoogleDocsService
+from ..services.github_service import GitHubService, GitHubError, RESUME_REPO_FIELDS, project_fields
+from ..services.sync_service import sync_user_repos
+
+logger = logging.getLogger(__name__)
 
 # APIRouter allows us to create a self-contained set of routes
 router = APIRouter()
 
-GITHUB_API_URL = "https://api.github.com"
-
 # Request models
 class EnhanceReposRequest(BaseModel):
     repos: list
     deepseek_api_key: str
 
+class SyncReposRequest(BaseModel):
+    deepseek_api_key: str
+    # Same values as the fetch_repos query parameter
+    fields: Optional[str] = None
+    include_unchanged: bool = False
+
 class GoogleDocsRequest(BaseModel):
     doc_url: str
 
+def _rate_limited(e: GitHubRateLimited) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="GitHub rate limit reached, please retry later",
+        headers={"Retry-After": str(max(1, round(e.retry_after)))},
+    )
+
+def _projection(fields: Optional[str]):
+    if fields == "resume":
+        return RESUME_REPO_FIELDS
+    if fields:
+        return [field.strip() for field in fields.split(",") if field.strip()]
+    return None
+
 @router.get("/connect")
 async def connect_github(authorization: str = Header(...)):
     """
@@ -25,9 +52,11 @@ async def connect_github(authorization: str = Header(...)):
     It expects the token to be in the 'Authorization' header.
     Example: "token ghp_YourTokenHere"
     """
-    headers = {"Authorization": authorization}
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{GITHUB_API_URL}/user", headers=headers)
+    try:
+        async with GitHubService(authorization) as github:
+            response = await github.get("/user")
+    except GitHubRateLimited as e:
+        raise _rate_limited(e)
     
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail="Invalid GitHub token or failed to authenticate")
@@ -35,97 +64,186 @@ async def connect_github(authorization: str = Header(...)):
     return response.json()
 
 @router.get("/fetch_repos")
-async def fetch_repos(authorization: str = Header(...)):
+async def fetch_repos(authorization: str = Header(...), stream: bool = False, fields: Optional[str] = None):
     """
     Fetches all public and private repositories for the authenticated user.
+
+    Every page is followed, not just the first 100 repos.
+    - stream=true returns NDJSON (one repo per line) as pages arrive
+    - fields=resume keeps only the fields the resume uses; a comma separated
+      list (e.g. fields=id,name,description) keeps exactly those
     """
-    headers = {"Authorization": authorization}
-    # We add params to get all repos, not just the first 30
-    params = {"per_page": 100}
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{GITHUB_API_URL}/user/repos", headers=headers, params=params)
-    
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail="Could not fetch repositories")
-    
-    return response.json()
+    projection = _projection(fields)
+
+    if not stream:
+        repos = []
+        try:
+            async with GitHubService(authorization) as github:
+                async for page in github.iter_pages("/user/repos"):
+                    repos.extend(project_fields(repo, projection) for repo in page)
+        except GitHubError as e:
+            raise HTTPException(status_code=e.status_code, detail="Could not fetch repositories")
+        except GitHubRateLimited as e:
+            raise _rate_limited(e)
+        return repos
+
+    async def repo_pages():
+        async with GitHubService(authorization) as github:
+            async for page in github.iter_pages("/user/repos"):
+                yield page
+
+    # Fetch the first page before answering so auth errors still get a proper
+    # status; an error ends repo_pages(), which leaves the service behind
+    pages = repo_pages()
+    try:
+        first_page = await anext(pages)
+    except GitHubError as e:
+        raise HTTPException(status_code=e.status_code, detail="Could not fetch repositories")
+    except GitHubRateLimited as e:
+        raise _rate_limited(e)
+
+    async def ndjson():
+        try:
+            for repo in first_page:
+                yield json.dumps(project_fields(repo, projection)) + "\n"
+            async for page in pages:
+                for repo in page:
+                    yield json.dumps(project_fields(repo, projection)) + "\n"
+        except GitHubError as e:
+            # Headers are already sent; report the failure in-band
+            yield json.dumps({"error": str(e), "status_code": e.status_code}) + "\n"
+        except GitHubRateLimited as e:
+            yield json.dumps({"error": str(e), "status_code": 429, "retry_after": round(e.retry_after)}) + "\n"
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.post("/enhance_repos")
-async def enhance_repos(request: EnhanceReposRequest, authorization: str = Header(...)):
+async def enhance_repos(request: EnhanceReposRequest, response: Response, authorization: str = Header(...)):
     """
     Enhance ALL repositories with AI-generated descriptions.
     Fetches README files and uses DeepSeek to generate professional descriptions.
+
+    Each repo carries an 'enhancement_status'. If GitHub data could not be
+    fetched for some repos (e.g. rate limits), the X-Enhancement-Incomplete
+    header gives their count.
     """
     try:
-        headers = {"Authorization": authorization}
         llm_service = DeepSeekService(api_key=request.deepseek_api_key)
+        enhanced_repos = await enhance_user_repos(request.repos, authorization, llm_service)
+        response.headers["X-Enhancement-Incomplete"] = str(count_incomplete(enhanced_repos))
         
-        print(f"Starting AI enhancement for {len(request.repos)} repositories...")
-        
-        async def fetch_readme(repo_full_name: str) -> Optional[str]:
-            """Fetch README content from GitHub using the user's token"""
-            try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(
-                        f"{GITHUB_API_URL}/repos/{repo_full_name}/readme",
-                        headers={**headers, "Accept": "application/vnd.github.raw+json"}
-                    )
-                    if response.status_code == 200:
-                        content = response.text
-                        print(f"✓ Fetched README for {repo_full_name} ({len(content)} chars)")
-                        return content
-                    else:
-                        print(f"✗ No README found for {repo_full_name} (status: {response.status_code})")
-            except Exception as e:
-                print(f"✗ Error fetching README for {repo_full_name}: {e}")
-            return None
-        
-        # Process each repo and enhance ALL descriptions
-        enhanced_repos = []
-        for idx, repo in enumerate(request.repos, 1):
-            print(f"\n[{idx}/{len(request.repos)}] Processing {repo['name']}...")
-            
-            # Fetch README content
-            readme = await fetch_readme(repo['full_name'])
-            
-            if readme and len(readme.strip()) > 10:  # Make sure README has content
-                print(f"  Generating AI description...")
-                try:
-                    new_description = llm_service.generate_project_description(
-                        readme, 
-                        repo['name']
-                    )
-                    if new_description and len(new_description) > 10:
-                        repo['description'] = new_description
-                        print(f"  ✓ Generated: {repo['description'][:100]}...")
-                    else:
-                        print(f"  ✗ AI returned empty description")
-                        repo['description'] = repo.get('description') or f"GitHub project: {repo['name']}"
-                except Exception as e:
-                    print(f"  ✗ AI generation failed: {e}")
-                    repo['description'] = repo.get('description') or f"GitHub project: {repo['name']}"
-            else:
-                # No README, keep original or create basic description
-                if not repo.get('description'):
-                    repo['description'] = f"GitHub project: {repo['name']}"
-                    print(f"  → No README, using basic description")
-                else:
-                    print(f"  → Keeping original: {repo['description'][:100]}...")
-            
-            enhanced_repos.append(repo)
-        
-        print(f"\n✓ Enhanced {len(enhanced_repos)} repositories successfully!")
+        logger.info("Enhanced %d repositories", len(enhanced_repos))
         return enhanced_repos
         
     except Exception as e:
-        print(f"\n✗ Error enhancing repos: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error enhancing repos")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/sync_repos")
+async def sync_repos(request: SyncReposRequest, response: Response, authorization: str = Header(...)):
+    """
+    Incremental sync: only the repos that are new, changed or deleted since
+    this user's last sync.
+
+    A server-side snapshot keeps each repo's pushed_at, README SHA and
+    enhanced description, so only repos whose README changed are sent to
+    the LLM again. The first sync returns every repo as new. Set
+    include_unchanged to also get the unchanged ones back (e.g. after the
+    extension lost its local copy).
+    """
+    try:
+        llm_service = DeepSeekService(api_key=request.deepseek_api_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        delta = await sync_user_repos(authorization, llm_service, include_unchanged=request.include_unchanged)
+    except GitHubError as e:
+        raise HTTPException(status_code=e.status_code, detail="Could not fetch repositories")
+    except GitHubRateLimited as e:
+        raise _rate_limited(e)
+
+    response.headers["X-Enhancement-Incomplete"] = str(count_incomplete(delta["new"] + delta["changed"]))
+    projection = _projection(request.fields)
+    if projection is not None:
+        # Clients need the per-repo outcome whatever fields they asked for
+        projection = [*projection, "enhancement_status"]
+    for key in ("new", "changed", "unchanged"):
+        if isinstance(delta[key], list):
+            delta[key] = [project_fields(repo, projection) for repo in delta[key]]
+    return delta
+
+
+@router.post("/enhance_jobs", status_code=202)
+async def submit_enhance_job(request: EnhanceReposRequest, authorization: str = Header(...)):
+    """
+    Start enhancing repositories in the background and return immediately.
+
+    Follow progress at events_url: Server-Sent Events by default, or NDJSON
+    with ?format=ndjson. Each enhanced repo is sent as soon as it is ready,
+    followed by a final summary. Results stay available at status_url for
+    a while after the job finishes.
+    """
+    try:
+        llm_service = DeepSeekService(api_key=request.deepseek_api_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job = job_manager.submit(
+        len(request.repos),
+        lambda on_result: enhance_user_repos(request.repos, authorization, llm_service, on_result=on_result),
+    )
+    return {
+        "job_id": job.id,
+        "total": job.total,
+        "status_url": f"/api/enhance_jobs/{job.id}",
+        "events_url": f"/api/enhance_jobs/{job.id}/events",
+    }
+
+
+@router.get("/enhance_jobs/{job_id}")
+async def get_enhance_job(job_id: str):
+    """
+    Job status plus every result so far, in input order (null = not done yet)
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return {**job.summary(), "results": job.results}
+
+
+@router.get("/enhance_jobs/{job_id}/events")
+async def stream_enhance_job(job_id: str, format: str = "sse"):
+    """
+    Stream job events: one 'result' per enhanced repo, then a 'summary'.
+    Earlier events are replayed, so reconnecting clients miss nothing.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    if format == "ndjson":
+        async def ndjson():
+            async for event in job.events():
+                yield json.dumps(event) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    async def sse():
+        async for event in job.events():
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/parse_google_doc")
 async def parse_google_doc(request: GoogleDocsRequest):
     """
@@ -134,15 +252,12 @@ async def parse_google_doc(request: GoogleDocsRequest):
     """
     try:
         doc_id = GoogleDocsService.extract_doc_id(request.doc_url)
-        content = await GoogleDocsService.fetch_doc_content(doc_id)
-        parsed_data = GoogleDocsService.parse_cv_content(content)
+        parsed_data = await GoogleDocsService.fetch_and_parse(doc_id)
         
         return parsed_data
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Error parsing Google Doc: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error parsing Google Doc")
         raise HTTPException(status_code=500, detail=f"Failed to parse document: {str(e)}")
\ No newline at end of file
@@ -1,12 +1,18 @@
 # backend/routes/resume.py
 
-from fastapi import APIRouter, Body
-from fastapi.responses import Response, HTMLResponse
-from jinja2 import Environment, FileSystemLoader
+from fastapi import APIRouter, Body, Header, HTTPException
+from fastapi.responses import Response, HTMLResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from weasyprint import HTML, CSS
-from io import BytesIO
+from typing import List, Dict, Any, Optional
+import logging
+import os
+from ..services.render_service import pdf_cache, render_html, render_pool, resume_cache_key, RenderQueueFull, RenderTimeout
+from ..services.batch_render_service import RenderJob, stream_resume_zip
+
+# Largest number of PDFs (people x templates) one batch request may ask for
+BATCH_MAX_DOCUMENTS = int(os.getenv("BATCH_MAX_DOCUMENTS", "1000"))
+
+logger = logging.getLogger(__name__)
 
 # Define a Pydantic model to validate the incoming data structure
 class ResumeData(BaseModel):
@@ -14,37 +20,86 @@ class ResumeData(BaseModel):
     sections: List[Dict[str, Any]]
     template: str
 
+class BatchResumeEntry(BaseModel):
+    data: ResumeData
+    # Templates to render this person with; defaults to data.template
+    templates: Optional[List[str]] = None
+    # Used in the archive file names; defaults to user_details.name
+    label: Optional[str] = None
+
+class BatchResumeRequest(BaseModel):
+    resumes: List[BatchResumeEntry]
+
 router = APIRouter()
-env = Environment(loader=FileSystemLoader('backend/templates'))
 
 @router.post("/generate_resume")
-async def generate_resume(data: ResumeData): # <-- Use our Pydantic model for validation
-    
-   
+async def generate_resume(data: ResumeData, if_none_match: Optional[str] = Header(None)): # <-- Use our Pydantic model for validation
+    """
+    Render the resume to PDF.
+
+    PDFs are cached by a canonical hash of the resume data and template, which
+    is also sent as the ETag. Re-sending it in If-None-Match gets a 304 when
+    nothing changed.
+    """
     # Convert the Pydantic model to a standard Python dictionary
     # The .model_dump() method is the modern way to do this in Pydantic v2
     resume_dict = data.model_dump() 
     
-    template_name = resume_dict.get("template", "resume_modern") + ".html"
-    template = env.get_template(template_name)
+    cache_key = resume_cache_key(resume_dict)
+    etag = f'"{cache_key}"'
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    cached_pdf = pdf_cache.get(cache_key)
+    if cached_pdf is not None:
+        return Response(content=cached_pdf, media_type='application/pdf', headers={"ETag": etag, "X-Cache": "HIT"})
+
+    # Never log the resume itself: it is personal data
+    logger.debug("Rendering %s with %d sections", resume_dict["template"], len(resume_dict["sections"]))
 
-    import json
-    print("---- DATA GOING TO TEMPLATE ----")
-    print(json.dumps(resume_dict, indent=2))
-    print("--------------------------------")
-    
     # Pass the dictionary to the template, not the Pydantic model
-    html_content = template.render(resume_dict)
+    html_content = render_html(resume_dict)
     
-    # Generate PDF using WeasyPrint
+    # Generate PDF using WeasyPrint, in the render worker pool
     try:
-        pdf_bytes = HTML(string=html_content).write_pdf()
-        print(f"PDF generated successfully: {len(pdf_bytes)} bytes")
-        return Response(content=pdf_bytes, media_type='application/pdf')
+        pdf_bytes = await render_pool.render(html_content)
+        logger.info("PDF generated successfully: %d bytes", len(pdf_bytes))
+        pdf_cache.set(cache_key, pdf_bytes)
+        return Response(content=pdf_bytes, media_type='application/pdf', headers={"ETag": etag, "X-Cache": "MISS"})
         
-    except Exception as e:
-        print(f"Exception during PDF generation: {e}")
-        import traceback
-        traceback.print_exc()
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except RenderTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception:
+        logger.exception("Exception during PDF generation")
         # Return HTML as fallback
-        return HTMLResponse(content=html_content)
\ No newline at end of file
+        return HTMLResponse(content=html_content)
+
+
+
+@router.post("/generate_resumes_batch")
+async def generate_resumes_batch(request: BatchResumeRequest):
+    """
+    Render many resumes, each with one or more templates, and stream them back
+    as a ZIP archive. PDFs are added as soon as they finish; manifest.json at
+    the end of the archive lists every file and whether it rendered.
+    """
+    jobs = []
+    for index, entry in enumerate(request.resumes, 1):
+        resume_dict = entry.data.model_dump()
+        label = entry.label or resume_dict["user_details"].get("name") or f"resume_{index}"
+        for template in entry.templates or [entry.data.template]:
+            jobs.append(RenderJob(index, label, resume_dict, template))
+
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No resumes to render")
+    if len(jobs) > BATCH_MAX_DOCUMENTS:
+        raise HTTPException(status_code=413, detail=f"A batch may contain at most {BATCH_MAX_DOCUMENTS} documents")
+
+    logger.info("Rendering batch of %d documents for %d resumes", len(jobs), len(request.resumes))
+    return StreamingResponse(
+        stream_resume_zip(jobs),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'},
+    )
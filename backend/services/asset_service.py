@@ -0,0 +1,165 @@
+# backend/services/asset_service.py
+
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import url2pathname
+
+from weasyprint.urls import URLFetcher, URLFetcherResponse
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+FONTS_DIR = os.path.join(STATIC_DIR, "fonts")
+
+# Offline by default: PDF renders only ever read files from STATIC_DIR
+ALLOW_REMOTE_ASSETS = os.getenv("RENDER_ALLOW_REMOTE_ASSETS", "false").lower() in ("1", "true", "yes")
+
+# Fonts the templates use, vendored as static/fonts/{Family}-{weight}.woff2
+FONT_FACES: Dict[str, Tuple[int, ...]] = {
+    "Inter": (400, 500, 700),
+    "Lora": (700,),
+}
+
+# The templates @import Google Fonts so previews look right in a browser. For
+# PDFs those imports are answered with an empty stylesheet and the fonts come
+# from the shared local stylesheet built by font_face_css() instead. Only
+# with RENDER_ALLOW_REMOTE_ASSETS set are imports whose fonts are not
+# vendored loaded from Google.
+REPLACED_STYLESHEET_HOSTS = ("fonts.googleapis.com",)
+
+_MIME_TYPES = {".woff2": "font/woff2", ".woff": "font/woff", ".ttf": "font/ttf", ".otf": "font/otf"}
+
+
+def font_face_css(fonts_dir: str = FONTS_DIR) -> str:
+    """
+    @font-face rules for every vendored font file that is present. URLs are
+    relative to STATIC_DIR. Missing files are skipped, so rendering falls back
+    to system fonts rather than failing.
+    """
+    rules = []
+    for family, weights in FONT_FACES.items():
+        for weight in weights:
+            filename = f"{family}-{weight}.woff2"
+            if os.path.exists(os.path.join(fonts_dir, filename)):
+                rules.append(
+                    f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+                    f"src: url('fonts/{filename}') format('woff2'); }}"
+                )
+    return "\n".join(rules)
+
+
+def requested_font_files(url: str) -> List[str]:
+    """
+    Vendored file names a Google Fonts css2 URL asks for, e.g.
+    family=Inter:wght@400;700 -> ["Inter-400.woff2", "Inter-700.woff2"]
+    """
+    files = []
+    for spec in parse_qs(urlsplit(url).query).get("family", []):
+        family, _, axes = spec.partition(":")
+        weights = axes.partition("@")[2].split(";") if "wght@" in axes else ["400"]
+        files.extend(f"{family}-{weight}.woff2" for weight in weights if weight)
+    return files
+
+
+@lru_cache(maxsize=64)
+def fonts_vendored(url: str, fonts_dir: str = FONTS_DIR) -> bool:
+    """Whether every face a Google Fonts stylesheet URL requests exists locally"""
+    files = requested_font_files(url)
+    vendored = bool(files) and all(os.path.exists(os.path.join(fonts_dir, name)) for name in files)
+    if not vendored:
+        logger.warning(
+            "Fonts for %s are not vendored "
+            "(run `python -m backend.services.asset_service` to vendor them)", url
+        )
+    return vendored
+
+
+def assets_version(fonts_dir: str = FONTS_DIR) -> str:
+    """
+    Fingerprint of the vendored fonts. Part of the PDF cache key, so a PDF
+    rendered before the fonts were vendored is not served afterwards.
+    """
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(fonts_dir)) if os.path.isdir(fonts_dir) else ():
+        digest.update(f"{filename}:{os.path.getsize(os.path.join(fonts_dir, filename))};".encode())
+    return digest.hexdigest()[:16]
+
+
+@lru_cache(maxsize=256)
+def _read_asset(path: str) -> bytes:
+    # Vendored assets never change while the app runs, so read each one once
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class LocalAssetFetcher(URLFetcher):
+    """
+    WeasyPrint URL fetcher backed by the local asset store.
+
+    - file: URLs are served from STATIC_DIR only (and cached in memory)
+    - Google Fonts stylesheet imports resolve to an empty stylesheet (loaded
+      from Google instead only when their fonts are not vendored and
+      RENDER_ALLOW_REMOTE_ASSETS is set)
+    - data: URLs are decoded as usual
+    - anything else is refused unless RENDER_ALLOW_REMOTE_ASSETS is set
+    """
+
+    def __init__(self, static_dir: str = STATIC_DIR, allow_remote: bool = ALLOW_REMOTE_ASSETS, **kwargs):
+        super().__init__(**kwargs)
+        self.static_dir = os.path.realpath(static_dir)
+        self.allow_remote = allow_remote
+
+    def fetch(self, url, headers=None):
+        parts = urlsplit(url)
+        if parts.scheme == "file":
+            path = os.path.realpath(url2pathname(parts.path))
+            if os.path.commonpath([path, self.static_dir]) != self.static_dir:
+                raise PermissionError(f"Asset outside the static directory: {url}")
+            extension = os.path.splitext(path)[1].lower()
+            mime_type = _MIME_TYPES.get(extension) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+            return URLFetcherResponse(url, body=_read_asset(path), headers={"Content-Type": mime_type})
+        if parts.hostname in REPLACED_STYLESHEET_HOSTS:
+            if not fonts_vendored(url, os.path.join(self.static_dir, "fonts")) and self.allow_remote:
+                return super().fetch(url, headers)
+            return URLFetcherResponse(url, body=b"", headers={"Content-Type": "text/css"})
+        if parts.scheme == "data" or self.allow_remote:
+            return super().fetch(url, headers)
+        raise ValueError(f"Remote asset blocked, renders are offline: {url}")
+
+
+def vendor_fonts(fonts_dir: str = FONTS_DIR):
+    """
+    Download the latin subset of every font in FONT_FACES from Google Fonts
+    into the asset store. Run once on a machine with network access:
+
+        python -m backend.services.asset_service
+    """
+    import httpx
+
+    families = "&".join(
+        f"family={family.replace(' ', '+')}:wght@{';'.join(map(str, weights))}"
+        for family, weights in FONT_FACES.items()
+    )
+    # A modern User-Agent makes Google serve woff2
+    user_agent = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    css = httpx.get(f"https://fonts.googleapis.com/css2?{families}", headers={"User-Agent": user_agent}).text
+
+    os.makedirs(fonts_dir, exist_ok=True)
+    for block in re.findall(r"/\* latin \*/\s*@font-face\s*{([^}]*)}", css):
+        family = re.search(r"font-family:\s*'([^']+)'", block).group(1)
+        weight = re.search(r"font-weight:\s*(\d+)", block).group(1)
+        font_url = re.search(r"url\(([^)]+)\)", block).group(1)
+        target = os.path.join(fonts_dir, f"{family}-{weight}.woff2")
+        with open(target, "wb") as f:
+            f.write(httpx.get(font_url).content)
+        print(f"✓ {family} {weight} -> {target}")
+
+
+if __name__ == "__main__":
+    vendor_fonts()
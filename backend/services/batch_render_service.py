@@ -0,0 +1,131 @@
+# backend/services/batch_render_service.py
+
+import asyncio
+import io
+import json
+import logging
+import os
+import re
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .render_service import pdf_cache, render_html, render_pool, resume_cache_key, RenderQueueFull
+
+logger = logging.getLogger(__name__)
+
+# Renders one batch keeps in flight; defaults to one per pool worker
+BATCH_RENDER_CONCURRENCY = int(os.getenv("BATCH_RENDER_CONCURRENCY", "0")) or render_pool.workers
+# Renders all batches together may have in the pool's queue; the rest of the
+# queue is reserved for interactive requests. Defaults to half the queue.
+BATCH_RENDER_QUEUE_SHARE = min(
+    int(os.getenv("BATCH_RENDER_QUEUE_SHARE", "0")) or render_pool.queue_size // 2,
+    render_pool.queue_size - 1,
+) or 1
+
+_batch_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_batch_slots() -> asyncio.Semaphore:
+    global _batch_slots
+    if _batch_slots is None:
+        _batch_slots = asyncio.Semaphore(BATCH_RENDER_QUEUE_SHARE)
+    return _batch_slots
+
+
+class RenderJob:
+    """One (resume, template) pair of a batch and the archive entry it produces"""
+
+    def __init__(self, index: int, label: str, resume_dict: Dict[str, Any], template: str):
+        self.resume_dict = {**resume_dict, "template": template}
+        self.template = template
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "_", label).strip("_") or "resume"
+        self.filename = f"{index:04d}_{slug}_{template}.pdf"
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink: zipfile falls back to data descriptors and
+    every chunk it writes can be handed to the client right away"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _render_job(job: RenderJob) -> bytes:
+    cache_key = resume_cache_key(job.resume_dict)
+    cached = pdf_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    html_content = render_html(job.resume_dict)
+    async with _get_batch_slots():
+        while True:
+            try:
+                pdf_bytes = await render_pool.render(html_content)
+                break
+            except RenderQueueFull as e:
+                # The queue is full of interactive requests; wait for a free place
+                await asyncio.sleep(min(e.retry_after, 1))
+    pdf_cache.set(cache_key, pdf_bytes)
+    return pdf_bytes
+
+
+async def stream_resume_zip(jobs: List[RenderJob], concurrency: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Render every job and stream a ZIP archive, adding each PDF as it finishes.
+
+    Jobs are submitted in request order and entries are added as they
+    complete. At most `concurrency` finished PDFs wait for the client at any
+    time; rendered PDFs also go to the shared PDF cache. All batches together
+    use at most BATCH_RENDER_QUEUE_SHARE places in the render queue, so
+    interactive requests always find room.
+    Failed renders are skipped; manifest.json at the end lists every entry
+    with its status.
+    """
+    concurrency = concurrency or BATCH_RENDER_CONCURRENCY
+    pending = iter(jobs)
+    finished: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def worker():
+        for job in pending:
+            try:
+                await finished.put((job, await _render_job(job), None))
+            except Exception as e:
+                await finished.put((job, None, str(e)))
+
+    sink = _ZipStream()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(jobs)) or 1)]
+    manifest = []
+    try:
+        for _ in range(len(jobs)):
+            job, pdf_bytes, error = await finished.get()
+            if pdf_bytes is not None:
+                archive.writestr(job.filename, pdf_bytes)
+                manifest.append({"file": job.filename, "template": job.template, "status": "ok"})
+            else:
+                logger.warning("Batch render failed for %s: %s", job.filename, error)
+                manifest.append({"file": job.filename, "template": job.template, "status": "error", "error": error})
+            yield sink.pop()
+
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+        archive.close()
+        yield sink.pop()
+    finally:
+        for task in workers:
+            task.cancel()
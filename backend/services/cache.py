@@ -0,0 +1,248 @@
+# backend/services/cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# Eviction policies LRUCache understands: least recently used, first in
+# first out, and least frequently used (ties go to the oldest entry)
+EVICTION_POLICIES = ("lru", "fifo", "lfu")
+
+
+class CacheStats:
+    """Hit/miss/eviction counters shared by every cache tier"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with optional TTL.
+
+    Bounded by entry count and, when `sizeof` is given, by the total size of
+    the stored values (e.g. bytes for rendered PDFs). `policy` picks what is
+    evicted first (see EVICTION_POLICIES); LFU eviction scans every entry, so
+    keep it to caches of a few thousand entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        policy: str = "lru",
+    ):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}, expected one of {EVICTION_POLICIES}")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.policy = policy
+        self.stats = CacheStats()
+        self.total_bytes = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._uses: Dict[str, int] = {}  # key -> hit count, LFU only
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at < time.time():
+                self._remove(key)
+                self.stats.misses += 1
+                return None
+            if self.policy == "lru":
+                self._data.move_to_end(key)
+            elif self.policy == "lfu":
+                self._uses[key] += 1
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        with self._lock:
+            uses = self._uses.get(key, 0)  # Overwriting keeps the use count
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.time() + ttl if ttl else None, size)
+            self.total_bytes += size
+            if self.policy == "lfu":
+                self._uses[key] = uses
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                self._remove(self._victim(newest=key))
+                self.stats.evictions += 1
+
+    def _victim(self, newest: str) -> str:
+        if self.policy == "lfu" and len(self._data) > 1:
+            # Never the entry being stored; among the rest min() keeps the
+            # first of equal counts, i.e. the oldest
+            return min((k for k in self._data if k != newest), key=self._uses.__getitem__)
+        return next(iter(self._data))
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._uses.clear()
+            self.total_bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size = self._data.pop(key)
+        self._uses.pop(key, None)
+        self.total_bytes -= size
+
+
+class SQLiteCache:
+    """
+    On-disk cache tier backed by a single SQLite table.
+
+    Values must be JSON serialisable. Entries expire after `ttl` seconds and
+    the least recently used rows are dropped once `max_entries` is exceeded.
+    Lookups are local and sub-millisecond, so callers use it synchronously.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: Optional[float] = None, table: str = "cache"):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.table = table
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._writes = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                self.stats.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        self.stats.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl if ttl else None, now),
+            )
+            self._writes += 1
+            # Pruning scans the table, so only do it every so often
+            if self._writes % 100 == 0:
+                self._prune(now)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _prune(self, now: float):
+        cursor = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+        evicted = max(cursor.rowcount, 0)
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            evicted += max(cursor.rowcount, 0)
+        self.stats.evictions += evicted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """
+    An in-memory LRU tier in front of an optional on-disk tier.
+
+    Disk hits are promoted into memory so hot entries stay cheap to read.
+    `stats` counts a hit when either tier answers.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def info(self) -> Dict[str, Any]:
+        info = {"memory_entries": len(self.memory), **self.stats.as_dict()}
+        if self.disk is not None:
+            info["disk"] = self.disk.stats.as_dict()
+        return info
@@ -0,0 +1,205 @@
+# backend/services/enhancement_service.py
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .github_service import GitHubService, GitHubError, GITHUB_RAW
+from .llm_service import DeepSeekService
+from .metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# Separate limits for the two stages: GitHub is cheap and fast, the LLM is
+# slow and rate limited, so they should not share a single concurrency budget.
+README_CONCURRENCY = int(os.getenv("ENHANCE_README_CONCURRENCY", "16"))
+LLM_CONCURRENCY = int(os.getenv("ENHANCE_LLM_CONCURRENCY", "4"))
+# Per-call timeouts (seconds). Time spent waiting for a free slot is not counted.
+README_TIMEOUT = float(os.getenv("ENHANCE_README_TIMEOUT", "30"))
+LLM_TIMEOUT = float(os.getenv("ENHANCE_LLM_TIMEOUT", "60"))
+
+ReadmeFetcher = Callable[[str], Awaitable[Optional[str]]]
+DescriptionGenerator = Callable[[str, str], Awaitable[str]]
+# Called with (input index, enhanced repo) as soon as each repo is done
+ResultCallback = Callable[[int, Dict[str, Any]], None]
+
+# Values of repo['enhancement_status'] set by the pipeline
+STATUS_ENHANCED = "enhanced"
+STATUS_NO_README = "no_readme"
+STATUS_LLM_FAILED = "llm_failed"
+# The README could not be fetched (rate limit, GitHub error, timeout), so the
+# description was not regenerated; retrying later may succeed
+STATUS_INCOMPLETE = "incomplete"
+
+
+class EnhancementPipeline:
+    """
+    Enhances many repositories concurrently.
+
+    Every repo moves through two stages: fetch its README, then ask the LLM for
+    a description. Each stage is gated by its own semaphore, so READMEs keep
+    streaming in while earlier repos wait for the LLM. Results come back in
+    input order, and a repo that fails or times out keeps its original
+    description instead of failing the whole batch. Each repo gets an
+    'enhancement_status' so callers can tell missing data from a missing README.
+
+    The README fetcher returns None when a repo has no README and raises when
+    the README could not be retrieved.
+    """
+
+    def __init__(
+        self,
+        readme_fetcher: ReadmeFetcher,
+        description_generator: DescriptionGenerator,
+        readme_concurrency: int = None,
+        llm_concurrency: int = None,
+        readme_timeout: float = None,
+        llm_timeout: float = None,
+    ):
+        self.readme_fetcher = readme_fetcher
+        self.description_generator = description_generator
+        self.readme_timeout = readme_timeout or README_TIMEOUT
+        self.llm_timeout = llm_timeout or LLM_TIMEOUT
+        self._readme_slots = asyncio.Semaphore(readme_concurrency or README_CONCURRENCY)
+        self._llm_slots = asyncio.Semaphore(llm_concurrency or LLM_CONCURRENCY)
+
+    async def enhance(self, repos: List[Dict[str, Any]], on_result: ResultCallback = None) -> List[Dict[str, Any]]:
+        """
+        Enhance all repos and return them in the same order they were given.
+
+        Args:
+            repos: GitHub repository objects (must contain 'name' and 'full_name')
+            on_result: Optional callback receiving (index, repo) as each repo
+                finishes, in completion order
+
+        Returns:
+            The same repo dicts with their 'description' updated
+        """
+        total = len(repos)
+
+        async def run(idx: int, repo: Dict[str, Any]) -> Dict[str, Any]:
+            result = await self._enhance_one(repo, idx, total)
+            if on_result is not None:
+                on_result(idx - 1, result)
+            return result
+
+        return list(await asyncio.gather(*(run(idx, repo) for idx, repo in enumerate(repos, 1))))
+
+    async def _enhance_one(self, repo: Dict[str, Any], idx: int, total: int) -> Dict[str, Any]:
+        name = repo.get('name', '?')
+        try:
+            readme = await self._fetch_readme(repo['full_name'])
+        except Exception as e:
+            logger.warning("[%d/%d] README fetch failed for %s: %r", idx, total, name, e)
+            repo['description'] = repo.get('description') or f"GitHub project: {name}"
+            repo['enhancement_status'] = STATUS_INCOMPLETE
+            return repo
+
+        if not readme or len(readme.strip()) <= 10:  # Make sure README has content
+            repo['enhancement_status'] = STATUS_NO_README
+            if not repo.get('description'):
+                repo['description'] = f"GitHub project: {name}"
+                logger.debug("[%d/%d] No README for %s, using basic description", idx, total, name)
+            else:
+                logger.debug("[%d/%d] No README for %s, keeping original description", idx, total, name)
+            return repo
+
+        try:
+            new_description = await self._generate(readme, name)
+        except Exception as e:
+            logger.warning("[%d/%d] AI generation failed for %s: %r", idx, total, name, e)
+            new_description = None
+
+        if new_description and len(new_description) > 10:
+            repo['description'] = new_description
+            repo['enhancement_status'] = STATUS_ENHANCED
+            logger.debug("[%d/%d] Described %s (%d chars)", idx, total, name, len(new_description))
+        else:
+            if new_description is not None:
+                logger.warning("[%d/%d] AI returned empty description for %s", idx, total, name)
+            repo['description'] = repo.get('description') or f"GitHub project: {name}"
+            repo['enhancement_status'] = STATUS_LLM_FAILED
+        return repo
+
+    async def _fetch_readme(self, full_name: str) -> Optional[str]:
+        async with self._readme_slots:
+            with stage("readme_fetch"):
+                return await asyncio.wait_for(self.readme_fetcher(full_name), self.readme_timeout)
+
+    async def _generate(self, readme: str, name: str) -> str:
+        async with self._llm_slots:
+            return await asyncio.wait_for(self.description_generator(readme, name), self.llm_timeout)
+
+
+async def enhance_user_repos(
+    repos: List[Dict[str, Any]],
+    authorization: str,
+    llm_service: DeepSeekService,
+    on_result: ResultCallback = None,
+    details: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Enhance a user's repos end to end: batch-fetch README details over
+    GraphQL, fall back to REST per repo, then run the enhancement pipeline.
+
+    Args:
+        repos: GitHub repository objects as returned by /fetch_repos
+        authorization: The user's GitHub Authorization header
+        llm_service: DeepSeekService configured with the user's API key
+        on_result: Optional per-repo completion callback (see EnhancementPipeline)
+        details: GitHubService.fetch_repo_details() output the caller already
+            has for these repos; fetched here when omitted
+
+    Returns:
+        The enhanced repos, in input order
+    """
+    logger.info("Starting AI enhancement for %d repositories", len(repos))
+
+    async with GitHubService(authorization) as github:
+        # One GraphQL query covers many repos; REST is the per-repo fallback
+        if details is None:
+            details = await github.fetch_repo_details([repo['full_name'] for repo in repos])
+            logger.info("GraphQL batch returned %d/%d repos", len(details), len(repos))
+
+        for repo in repos:
+            info = details.get(repo['full_name'])
+            if info:
+                repo['language'] = repo.get('language') or info['language']
+                repo['topics'] = repo.get('topics') or info['topics']
+
+        async def fetch_readme(repo_full_name: str) -> Optional[str]:
+            """Fetch README content from GitHub using the user's token"""
+            if repo_full_name in details:
+                return details[repo_full_name]['readme']
+            # Rate limits and transport errors propagate: that is missing data, not a missing README
+            response = await github.get(f"/repos/{repo_full_name}/readme", accept=GITHUB_RAW)
+            if response.status_code == 200:
+                content = response.text
+                source = "cached" if response.from_cache else "fetched"
+                logger.debug("README for %s (%d chars, %s)", repo_full_name, len(content), source)
+                return content
+            if response.status_code == 404:
+                logger.debug("No README found for %s", repo_full_name)
+                return None
+            raise GitHubError(response.status_code, f"README request for {repo_full_name} returned {response.status_code}")
+
+        # In batched mode the LLM stage must let enough repos through to fill batches
+        pipeline = EnhancementPipeline(
+            fetch_readme,
+            llm_service.generate_project_description,
+            llm_concurrency=LLM_CONCURRENCY * max(llm_service.batch_size, 1),
+        )
+        enhanced = await pipeline.enhance(repos, on_result=on_result)
+
+    incomplete = count_incomplete(enhanced)
+    if incomplete:
+        logger.warning(
+            "%d/%d repos could not be fetched from GitHub; their descriptions were not regenerated",
+            incomplete, len(enhanced),
+        )
+    return enhanced
+
+
+def count_incomplete(repos: List[Dict[str, Any]]) -> int:
+    return sum(1 for repo in repos if repo.get('enhancement_status') == STATUS_INCOMPLETE)
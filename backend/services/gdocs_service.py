@@ -1,7 +1,151 @@
 # backend/services/gdocs_service.py
 
+import logging
+import os
 import re
-from typing import Dict, List, Any
+import time
+from typing import Dict, List, Any, Optional
+
+import httpx
+
+from .cache import LRUCache
+from .http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+# Parsed imports are served without contacting Google for this many seconds,
+# then revalidated (conditionally when the export sent validators)
+GDOC_CACHE_TTL = float(os.getenv("GDOC_CACHE_TTL", "60"))
+GDOC_CACHE_SIZE = int(os.getenv("GDOC_CACHE_SIZE", "512"))
+# Bound on the summed export sizes of the cached documents
+GDOC_CACHE_MAX_BYTES = int(os.getenv("GDOC_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# lru, fifo or lfu (see cache.EVICTION_POLICIES)
+GDOC_CACHE_POLICY = os.getenv("GDOC_CACHE_POLICY", "lru")
+
+# doc id -> {"result", "etag", "last_modified", "fetched_at", "size"}. Entries
+# never expire on their own: stale ones are still needed to revalidate.
+gdoc_cache = LRUCache(
+    max_entries=GDOC_CACHE_SIZE,
+    max_bytes=GDOC_CACHE_MAX_BYTES,
+    sizeof=lambda entry: entry["size"],
+    policy=GDOC_CACHE_POLICY,
+)
+
+# Section table: (key, header keywords, title of the emitted section).
+# When a header line matches several keywords the earliest row wins.
+# Adding a section type is one row here.
+CV_SECTIONS = (
+    ('personal', ('PERSONAL', 'CONTACT', 'INFO'), None),
+    ('education', ('EDUCATION',), 'Educational Qualifications'),
+    ('experience', ('EXPERIENCE', 'EMPLOYMENT', 'WORK'), 'Employment History'),
+    ('skills', ('SKILL',), 'Skills'),
+)
+
+
+
+def _trie_pattern(words) -> str:
+    """Regex alternation factored by common prefixes, e.g. E(?:DUCATION|XPERIENCE)"""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            # A keyword ends here; anything longer is redundant for a substring search
+            return ''
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+# Every header keyword in one precompiled pattern, matched against the
+# upper-cased line (cheaper than IGNORECASE). Which section a header belongs
+# to is only worked out for the rare lines that match.
+_HEADER_RE = re.compile(_trie_pattern(keyword for _, keywords, _ in CV_SECTIONS for keyword in keywords))
+_SECTION_TITLES = {key: title for key, _, title in CV_SECTIONS}
+
+
+class CVParser:
+    """
+    Incremental, single-pass CV parser. Feed it lines as they arrive and call
+    result() at the end.
+
+    Header detection is one regex search per line. Every section change
+    flushes the items collected so far, so no section is dropped whatever
+    order the document uses.
+    """
+
+    def __init__(self):
+        self.user_details: Dict[str, str] = {}
+        self.sections: List[Dict[str, Any]] = []
+        self.current_section: Optional[str] = None
+        self.current_items: List[Dict[str, str]] = []
+
+    @staticmethod
+    def _header(line: str) -> Optional[str]:
+        upper_line = line.upper()
+        if _HEADER_RE.search(upper_line) is None:
+            return None
+        # Several keywords may appear on one line; the earliest table row wins
+        for key, keywords, _ in CV_SECTIONS:
+            if any(keyword in upper_line for keyword in keywords):
+                return key
+
+    def feed(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+
+        # Check for section headers
+        header = self._header(line)
+        if header is not None:
+            self._flush()
+            self.current_section = header
+            return
+
+        # Parse content based on current section
+        if self.current_section == 'personal':
+            GoogleDocsService._parse_personal_info(line, self.user_details)
+        elif self.current_section in ('education', 'experience'):
+            item = GoogleDocsService._parse_section_item(line)
+            if item:
+                self.current_items.append(item)
+        elif self.current_section == 'skills':
+            # Parse comma-separated skills
+            skills = [s.strip() for s in line.replace('•', '').replace('-', '').split(',') if s.strip()]
+            for skill in skills:
+                self.current_items.append({
+                    'id': f'item_{len(self.current_items)+1}',
+                    'primary': skill,
+                    'secondary': '',
+                    'timeline': '',
+                    'description': ''
+                })
+
+    def _flush(self):
+        title = _SECTION_TITLES.get(self.current_section)
+        if title and self.current_items:
+            self.sections.append({
+                'id': f'sec_{len(self.sections)+1}',
+                'title': title,
+                'items': self.current_items
+            })
+        self.current_items = []
+
+    def result(self) -> Dict[str, Any]:
+        """Flush the last section and return the parsed CV"""
+        self._flush()
+        return {
+            "user_details": self.user_details,
+            "sections": self.sections
+        }
+
 
 class GoogleDocsService:
     """
@@ -22,24 +166,84 @@ class GoogleDocsService:
                 return match.group(1)
         raise ValueError("Invalid Google Docs URL")
     
+    @staticmethod
+    def export_url(doc_id: str) -> str:
+        """Public plain text export URL of a document"""
+        return f"https://docs.google.com/document/d/{doc_id}/export?format=txt"
+
     @staticmethod
     async def fetch_doc_content(doc_id: str) -> str:
         """
         Fetch document content as plain text.
         Uses the public export API for documents shared with 'Anyone with the link'
         """
-        import httpx
-        
-        # Export as plain text
-        export_url = f"https://docs.google.com/document/d/{doc_id}/export?format=txt"
+        export_url = GoogleDocsService.export_url(doc_id)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(export_url)
-            if response.status_code == 200:
-                return response.text
-            else:
-                raise Exception(f"Failed to fetch document: {response.status_code}. Make sure the document is shared with 'Anyone with the link'")
+        client = http_clients.get(export_url)
+        response = await client.get(export_url, follow_redirects=True)
+        if response.status_code == 200:
+            return response.text
+        else:
+            raise Exception(f"Failed to fetch document: {response.status_code}. Make sure the document is shared with 'Anyone with the link'")
     
+    @staticmethod
+    async def fetch_and_parse(doc_id: str, cache: LRUCache = gdoc_cache) -> Dict[str, Any]:
+        """
+        Fetch a document and parse it in a single streaming pass, reusing the
+        cached result while it is fresh or Google confirms it is unchanged.
+
+        Args:
+            doc_id: Google Docs document id
+            cache: Import cache (doc id -> parsed result and validators)
+
+        Returns:
+            Same structure as parse_cv_content
+        """
+        entry = cache.get(doc_id)
+        now = time.time()
+        if entry is not None and now - entry["fetched_at"] < GDOC_CACHE_TTL:
+            return entry["result"]
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        export_url = GoogleDocsService.export_url(doc_id)
+        client = http_clients.get(export_url)
+        try:
+            async with client.stream("GET", export_url, headers=headers, follow_redirects=True) as response:
+                if response.status_code == 304 and entry is not None:
+                    cache.set(doc_id, {**entry, "fetched_at": now})
+                    return entry["result"]
+                if response.status_code != 200:
+                    # Also drops the cached copy: the doc may no longer be shared
+                    cache.delete(doc_id)
+                    raise Exception(f"Failed to fetch document: {response.status_code}. Make sure the document is shared with 'Anyone with the link'")
+
+                parser = CVParser()
+                size = 0
+                async for line in response.aiter_lines():
+                    size += len(line) + 1
+                    parser.feed(line)
+                result = parser.result()
+        except httpx.TransportError as e:
+            if entry is None:
+                raise
+            logger.warning("Could not revalidate Google Doc %s, serving cached copy: %s", doc_id, e)
+            return entry["result"]
+
+        cache.set(doc_id, {
+            "result": result,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fetched_at": now,
+            "size": size,
+        })
+        return result
+
     @staticmethod
     def parse_cv_content(content: str) -> Dict[str, Any]:
         """
@@ -64,93 +268,10 @@ class GoogleDocsService:
         SKILLS
         - Python, JavaScript, React, Node.js
         """
-        lines = content.split('\n')
-        result = {
-            "user_details": {},
-            "sections": []
-        }
-        
-        current_section = None
-        current_items = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Check for section headers
-            upper_line = line.upper()
-            if 'PERSONAL' in upper_line or 'CONTACT' in upper_line or 'INFO' in upper_line:
-                current_section = 'personal'
-                continue
-            elif 'EDUCATION' in upper_line:
-                if current_section == 'personal' and current_items:
-                    # Save previous section
-                    pass
-                current_section = 'education'
-                current_items = []
-                continue
-            elif 'EXPERIENCE' in upper_line or 'EMPLOYMENT' in upper_line or 'WORK' in upper_line:
-                if current_section == 'education' and current_items:
-                    result['sections'].append({
-                        'id': f'sec_{len(result["sections"])+1}',
-                        'title': 'Educational Qualifications',
-                        'items': current_items
-                    })
-                current_section = 'experience'
-                current_items = []
-                continue
-            elif 'SKILL' in upper_line:
-                if current_section == 'experience' and current_items:
-                    result['sections'].append({
-                        'id': f'sec_{len(result["sections"])+1}',
-                        'title': 'Employment History',
-                        'items': current_items
-                    })
-                current_section = 'skills'
-                current_items = []
-                continue
-            
-            # Parse content based on current section
-            if current_section == 'personal':
-                GoogleDocsService._parse_personal_info(line, result['user_details'])
-            elif current_section in ['education', 'experience']:
-                item = GoogleDocsService._parse_section_item(line)
-                if item:
-                    current_items.append(item)
-            elif current_section == 'skills':
-                # Parse comma-separated skills
-                skills = [s.strip() for s in line.replace('•', '').replace('-', '').split(',') if s.strip()]
-                for skill in skills:
-                    current_items.append({
-                        'id': f'item_{len(current_items)+1}',
-                        'primary': skill,
-                        'secondary': '',
-                        'timeline': '',
-                        'description': ''
-                    })
-        
-        # Add remaining section
-        if current_section == 'education' and current_items:
-            result['sections'].append({
-                'id': f'sec_{len(result["sections"])+1}',
-                'title': 'Educational Qualifications',
-                'items': current_items
-            })
-        elif current_section == 'experience' and current_items:
-            result['sections'].append({
-                'id': f'sec_{len(result["sections"])+1}',
-                'title': 'Employment History',
-                'items': current_items
-            })
-        elif current_section == 'skills' and current_items:
-            result['sections'].append({
-                'id': f'sec_{len(result["sections"])+1}',
-                'title': 'Skills',
-                'items': current_items
-            })
-        
-        return result
+        parser = CVParser()
+        for line in content.split('\n'):
+            parser.feed(line)
+        return parser.result()
     
     @staticmethod
     def _parse_personal_info(line: str, user_details: dict):
@@ -0,0 +1,202 @@
+# backend/services/github_rate_limiter.py
+
+import asyncio
+import os
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+
+import httpx
+
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "4"))
+GITHUB_BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", "1.0"))
+GITHUB_BACKOFF_MAX = float(os.getenv("GITHUB_BACKOFF_MAX", "30"))
+# Never park a request longer than this; report the data as incomplete instead
+GITHUB_MAX_WAIT = float(os.getenv("GITHUB_MAX_WAIT", "60"))
+# Concurrent requests per token; GitHub's secondary limits punish bursts
+GITHUB_MAX_CONCURRENT_PER_TOKEN = int(os.getenv("GITHUB_MAX_CONCURRENT_PER_TOKEN", "16"))
+# Start spreading requests evenly once fewer than this many remain in the window
+GITHUB_PACING_THRESHOLD = int(os.getenv("GITHUB_PACING_THRESHOLD", "500"))
+GITHUB_MAX_TRACKED_TOKENS = int(os.getenv("GITHUB_MAX_TRACKED_TOKENS", "10000"))
+
+_RETRYABLE_STATUSES = (500, 502, 503, 504)
+
+
+class GitHubRateLimited(Exception):
+    """GitHub refused the request for rate-limit reasons and waiting would take too long"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"GitHub rate limit hit, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """Primary (remaining == 0) or secondary (Retry-After / abuse) rate limit responses"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return (
+        response.headers.get("x-ratelimit-remaining") == "0"
+        or "retry-after" in response.headers
+        or "rate limit" in response.text.lower()
+    )
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(GITHUB_BACKOFF_MAX, GITHUB_BACKOFF_BASE * 2 ** attempt))
+
+
+class TokenBudget:
+    """What GitHub last told us about one token's rate limit, plus pacing state"""
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.next_slot = 0.0
+        # Grows after secondary-limit hits and decays on success (AIMD)
+        self.min_interval = 0.0
+        self.slots = asyncio.Semaphore(GITHUB_MAX_CONCURRENT_PER_TOKEN)
+
+    def interval(self, now: float) -> float:
+        """Spacing between request starts the current budget allows"""
+        interval = self.min_interval
+        if self.remaining is not None and 0 < self.remaining < GITHUB_PACING_THRESHOLD and self.reset_at > now:
+            # Spread what is left evenly over the rest of the window
+            interval = max(interval, (self.reset_at - now) / self.remaining)
+        return interval
+
+    def reserve(self, now: float, max_wait: float = GITHUB_MAX_WAIT) -> Tuple[float, float]:
+        """
+        How long the next request has to wait, reserving its place in the
+        schedule only if that wait is acceptable.
+
+        Up to GITHUB_MAX_CONCURRENT_PER_TOKEN requests may run ahead of the
+        schedule, so the budget is spread across the concurrent lanes rather
+        than released one request per interval.
+
+        Returns:
+            (wait in seconds, interval reserved); nothing is reserved when
+            the wait exceeds max_wait
+        """
+        if self.blocked_until > now:
+            return self.blocked_until - now, 0.0
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at > now:
+            return self.reset_at - now, 0.0
+        interval = self.interval(now)
+        cursor = max(now, self.next_slot) + interval
+        wait = max(0.0, cursor - now - interval * GITHUB_MAX_CONCURRENT_PER_TOKEN)
+        if wait > max_wait:
+            return wait, 0.0
+        self.next_slot = cursor
+        return wait, interval
+
+    def release(self, interval: float):
+        """Give back a reservation for a request GitHub did not count (a 304)"""
+        self.next_slot -= interval
+
+    def record(self, response: httpx.Response, now: float):
+        headers = response.headers
+        if "x-ratelimit-remaining" in headers:
+            self.remaining = int(headers["x-ratelimit-remaining"])
+        if "x-ratelimit-reset" in headers:
+            self.reset_at = float(headers["x-ratelimit-reset"])
+
+        if is_rate_limited(response):
+            retry_after = headers.get("retry-after")
+            if retry_after is not None:
+                self.blocked_until = now + float(retry_after)
+            elif self.remaining == 0 and self.reset_at > now:
+                self.blocked_until = self.reset_at
+            else:
+                self.blocked_until = now + backoff_delay(3)
+            self.min_interval = min(max(self.min_interval * 2, 0.25), 5.0)
+        elif response.status_code < 400:
+            self.min_interval *= 0.9
+            if self.min_interval < 0.01:
+                self.min_interval = 0.0
+
+
+class GitHubRateLimiter:
+    """
+    Schedules GitHub requests per token: caps concurrency, paces requests
+    from X-RateLimit-Remaining/Reset, honours Retry-After, and slows down
+    adaptively after secondary rate-limit hits.
+    """
+
+    def __init__(self):
+        self._budgets: "OrderedDict[str, TokenBudget]" = OrderedDict()
+
+    def budget(self, scope: str) -> TokenBudget:
+        budget = self._budgets.get(scope)
+        if budget is None:
+            budget = self._budgets[scope] = TokenBudget()
+            while len(self._budgets) > GITHUB_MAX_TRACKED_TOKENS:
+                self._budgets.popitem(last=False)
+        else:
+            self._budgets.move_to_end(scope)
+        return budget
+
+    @asynccontextmanager
+    async def slot(self, scope: str) -> AsyncIterator[Tuple[TokenBudget, float]]:
+        """
+        Wait for permission to send one request with this token.
+
+        Yields:
+            (budget, interval reserved for this request)
+
+        Raises:
+            GitHubRateLimited: if the wait would exceed GITHUB_MAX_WAIT; such
+                a refused request does not take a place in the schedule
+        """
+        budget = self.budget(scope)
+        async with budget.slots:
+            wait, interval = budget.reserve(time.time())
+            if wait > GITHUB_MAX_WAIT:
+                raise GitHubRateLimited(wait)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield budget, interval
+
+    async def send(self, scope: str, send, *args, **kwargs) -> httpx.Response:
+        """
+        Send a request through the scheduler, retrying rate limits, 5xx
+        answers and transport errors with jittered exponential backoff.
+
+        Args:
+            scope: Token scope the request counts against
+            send: Coroutine function performing the request (e.g. client.get)
+
+        Raises:
+            GitHubRateLimited: if GitHub keeps rate limiting beyond GITHUB_MAX_WAIT
+        """
+        for attempt in range(GITHUB_MAX_RETRIES + 1):
+            last_attempt = attempt == GITHUB_MAX_RETRIES
+            async with self.slot(scope) as (budget, interval):
+                try:
+                    response = await send(*args, **kwargs)
+                except httpx.TransportError:
+                    if last_attempt:
+                        raise
+                    response = None
+                else:
+                    budget.record(response, time.time())
+                    if response.status_code == 304:
+                        # Conditional requests answered 304 do not count against the limit
+                        budget.release(interval)
+
+            if response is not None and is_rate_limited(response):
+                if last_attempt:
+                    raise GitHubRateLimited(max(budget.blocked_until - time.time(), 0))
+                continue  # slot() waits out blocked_until (or gives up) on the next attempt
+            if response is not None and (response.status_code not in _RETRYABLE_STATUSES or last_attempt):
+                return response
+            await asyncio.sleep(backoff_delay(attempt))
+        return response
+
+
+rate_limiter = GitHubRateLimiter()
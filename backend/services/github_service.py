@@ -0,0 +1,327 @@
+# backend/services/github_service.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import httpx
+
+from .cache import LRUCache, SQLiteCache, TieredCache
+from .github_rate_limiter import GitHubRateLimited, rate_limiter
+from .http_clients import http_clients
+from .metrics import registry, stage
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_JSON = "application/vnd.github+json"
+GITHUB_RAW = "application/vnd.github.raw+json"
+
+# Local store for conditional requests: in-memory, plus SQLite when GITHUB_CACHE_PATH is set
+GITHUB_CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+GITHUB_CACHE_ENTRIES = int(os.getenv("GITHUB_CACHE_ENTRIES", "20000"))
+GITHUB_CACHE_PATH = os.getenv("GITHUB_CACHE_PATH")
+# How many list pages to request at once once the last page number is known
+GITHUB_PAGE_CONCURRENCY = int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4"))
+
+# The repo fields the extension and resume templates actually use
+RESUME_REPO_FIELDS = (
+    "id", "name", "full_name", "description", "html_url", "homepage", "language",
+    "topics", "stargazers_count", "forks_count", "fork", "private", "archived",
+    "created_at", "updated_at", "pushed_at",
+)
+
+# Batched GraphQL lookups: repos per query, and queries in flight at once
+GITHUB_GRAPHQL_CHUNK = int(os.getenv("GITHUB_GRAPHQL_CHUNK", "25"))
+GITHUB_GRAPHQL_CONCURRENCY = int(os.getenv("GITHUB_GRAPHQL_CONCURRENCY", "2"))
+# GraphQL cannot ask for "the README", so probe the common file names
+README_CANDIDATES = ("README.md", "readme.md", "Readme.md", "README.rst", "README.txt", "README.markdown", "README")
+
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+_PAGE_RE = re.compile(r'[?&]page=(\d+)')
+
+# Response headers worth replaying when a body is served from the store
+_STORED_HEADERS = ("etag", "last-modified", "link", "content-type")
+
+
+def _build_response_store() -> TieredCache:
+    disk = None
+    if GITHUB_CACHE_PATH:
+        disk = SQLiteCache(GITHUB_CACHE_PATH, max_entries=GITHUB_CACHE_ENTRIES * 5, table="github_responses")
+    memory = LRUCache(
+        max_entries=GITHUB_CACHE_ENTRIES,
+        max_bytes=GITHUB_CACHE_MAX_BYTES,
+        sizeof=lambda entry: len(entry["body"]),
+    )
+    return TieredCache(memory, disk)
+
+
+# Validators and bodies of previous GitHub responses, shared by all requests
+response_store = _build_response_store()
+
+# Conditional requests GitHub answered 304 (served from the store) vs. with a new body
+revalidations = registry.counter("codefolio_github_revalidations_total", "Conditional GitHub requests by outcome")
+
+
+class GitHubError(Exception):
+    """A GitHub API call returned an unexpected status"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_link_header(link: Optional[str]) -> Dict[str, str]:
+    """Parse an RFC 5988 Link header into {rel: url}"""
+    return {rel: url for url, rel in _LINK_RE.findall(link or "")}
+
+
+def project_fields(item: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Keep only `fields` of a GitHub object (all of them when fields is None)"""
+    if fields is None:
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+class GitHubResponse:
+    """The parts of a GitHub response the routes need, live or replayed from the store"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], text: str, from_cache: bool = False):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self.from_cache = from_cache
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class GitHubService:
+    """
+    GitHub REST client that makes every GET conditional.
+
+    ETag / Last-Modified validators and bodies are stored per token and per
+    URL. When GitHub answers 304 Not Modified (which does not count against
+    the rate limit) the stored body is returned instead. Every request is
+    scheduled by the per-token rate limiter, which paces and retries it.
+
+    Requests go through the app-wide pooled client for the GitHub API.
+    Use as an async context manager to scope one request's calls:
+
+        async with GitHubService(authorization) as github:
+            response = await github.get("/user")
+    """
+
+    def __init__(self, authorization: str, store: TieredCache = None, base_url: str = GITHUB_API_URL):
+        self.authorization = authorization
+        self.store = store or response_store
+        self.base_url = base_url
+        # Responses differ per token, so validators are scoped to it (hashed, never stored raw)
+        self.scope = hashlib.sha256(authorization.encode()).hexdigest()[:32]
+        self._client = http_clients.get(base_url)
+
+    async def __aenter__(self) -> "GitHubService":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # The pooled client is shared and outlives this request
+        pass
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.base_url}{path}"
+
+    def _store_key(self, url: str, params: Optional[Dict[str, Any]], accept: str) -> str:
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{self.scope}\0{url}\0{query}\0{accept}".encode()).hexdigest()
+
+    async def get(self, path: str, params: Dict[str, Any] = None, accept: str = GITHUB_JSON) -> GitHubResponse:
+        """
+        Conditional GET against the GitHub API.
+
+        Args:
+            path: API path such as "/user" or a full URL (e.g. from a Link header)
+            params: Query parameters
+            accept: Accept header (use GITHUB_RAW for raw README bodies)
+
+        Returns:
+            GitHubResponse; `from_cache` is True when GitHub answered 304
+
+        Raises:
+            GitHubRateLimited: if GitHub keeps refusing for rate-limit reasons
+        """
+        url = self._url(path)
+        key = self._store_key(url, params, accept)
+        stored = self.store.get(key)
+
+        headers = {"Authorization": self.authorization, "Accept": accept}
+        if stored:
+            if stored["headers"].get("etag"):
+                headers["If-None-Match"] = stored["headers"]["etag"]
+            if stored["headers"].get("last-modified"):
+                headers["If-Modified-Since"] = stored["headers"]["last-modified"]
+
+        with stage("github_fetch", kind="rest"):
+            response = await rate_limiter.send(self.scope, self._client.get, url, headers=headers, params=params)
+
+        if stored:
+            revalidations.inc(result="not_modified" if response.status_code == 304 else "modified")
+        if response.status_code == 304 and stored:
+            return GitHubResponse(200, dict(stored["headers"]), stored["body"], from_cache=True)
+
+        kept_headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        if response.status_code == 200 and ("etag" in kept_headers or "last-modified" in kept_headers):
+            self.store.set(key, {"headers": kept_headers, "body": response.text})
+        return GitHubResponse(response.status_code, kept_headers, response.text)
+
+    async def iter_pages(self, path: str, params: Dict[str, Any] = None) -> AsyncIterator[List[Any]]:
+        """
+        Yield every page of a paginated list endpoint, in order.
+
+        The first page is fetched on its own. If its Link header gives the
+        last page number, the remaining pages are requested concurrently
+        (GITHUB_PAGE_CONCURRENCY at a time). Otherwise the `next` links are
+        followed one by one.
+
+        Raises:
+            GitHubError: if any page does not come back with 200
+            GitHubRateLimited: if a page stays rate limited
+        """
+        params = {"per_page": 100, **(params or {})}
+        first = await self._get_page(path, params)
+        yield first.json()
+
+        links = parse_link_header(first.headers.get("link"))
+        last_page = _PAGE_RE.search(links.get("last", ""))
+        if last_page:
+            async for page in self._fetch_pages_concurrently(path, params, range(2, int(last_page.group(1)) + 1)):
+                yield page
+            return
+
+        next_url = links.get("next")
+        while next_url:
+            response = await self._get_page(next_url, None)
+            yield response.json()
+            next_url = parse_link_header(response.headers.get("link")).get("next")
+
+    async def _fetch_pages_concurrently(self, path: str, params: Dict[str, Any], pages: range) -> AsyncIterator[List[Any]]:
+        slots = asyncio.Semaphore(GITHUB_PAGE_CONCURRENCY)
+
+        async def fetch(page: int) -> List[Any]:
+            async with slots:
+                return (await self._get_page(path, {**params, "page": page})).json()
+
+        tasks = [asyncio.ensure_future(fetch(page)) for page in pages]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # The consumer may stop early (e.g. the client disconnected)
+            for task in tasks:
+                task.cancel()
+
+    async def _get_page(self, path: str, params: Optional[Dict[str, Any]]) -> GitHubResponse:
+        response = await self.get(path, params=params)
+        if response.status_code != 200:
+            raise GitHubError(response.status_code, f"GitHub returned {response.status_code} for {path}")
+        return response
+
+    async def graphql(self, query: str, variables: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Run a GraphQL query and return its `data`.
+
+        Partial results are normal (e.g. one repo in a batch was deleted):
+        the failing fields come back as null and the rest is returned.
+
+        Raises:
+            GitHubError: if the GraphQL API is unavailable or returned no data
+        """
+        with stage("github_fetch", kind="graphql"):
+            response = await rate_limiter.send(
+                self.scope,
+                self._client.post,
+                self._url("/graphql"),
+                headers={"Authorization": self.authorization},
+                json={"query": query, "variables": variables or {}},
+            )
+        if response.status_code != 200:
+            raise GitHubError(response.status_code, f"GitHub GraphQL returned {response.status_code}")
+        payload = response.json()
+        if not payload.get("data"):
+            raise GitHubError(502, f"GitHub GraphQL error: {payload.get('errors')}")
+        return payload["data"]
+
+    async def fetch_repo_details(self, full_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch README text, description, primary language and topics for many
+        repos in a handful of GraphQL queries (GITHUB_GRAPHQL_CHUNK repos each).
+
+        Returns:
+            {full_name: {"readme", "readme_sha", "description", "language", "topics"}}.
+            Repos GraphQL could not resolve (including whole chunks when the
+            GraphQL API is unavailable), with no README under a common name,
+            or whose README blob was too big to inline, are left out so the
+            caller can use the REST endpoint, which also finds READMEs in
+            docs/ or .github/ and answers 404 when there really is none.
+        """
+        chunks = [full_names[i:i + GITHUB_GRAPHQL_CHUNK] for i in range(0, len(full_names), GITHUB_GRAPHQL_CHUNK)]
+        slots = asyncio.Semaphore(GITHUB_GRAPHQL_CONCURRENCY)
+
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+            async with slots:
+                try:
+                    return await self._fetch_details_chunk(chunk)
+                except (GitHubError, GitHubRateLimited, httpx.HTTPError) as e:
+                    logger.warning("GraphQL batch of %d repos failed, using REST for them: %s", len(chunk), e)
+                    return {}
+
+        details = {}
+        for result in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+            details.update(result)
+        return details
+
+    async def _fetch_details_chunk(self, full_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        readme_fields = "\n".join(
+            f'readme{i}: object(expression: "HEAD:{name}") {{ ... on Blob {{ oid text isBinary }} }}'
+            for i, name in enumerate(README_CANDIDATES)
+        )
+        declarations, selections, variables = [], [], {}
+        for i, full_name in enumerate(full_names):
+            owner, _, name = full_name.partition("/")
+            declarations.append(f"$owner{i}: String!, $name{i}: String!")
+            variables[f"owner{i}"], variables[f"name{i}"] = owner, name
+            selections.append(
+                f"repo{i}: repository(owner: $owner{i}, name: $name{i}) {{\n"
+                "  description\n"
+                "  primaryLanguage { name }\n"
+                "  repositoryTopics(first: 20) { nodes { topic { name } } }\n"
+                f"  {readme_fields}\n"
+                "}"
+            )
+        query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+        data = await self.graphql(query, variables)
+
+        details = {}
+        for i, full_name in enumerate(full_names):
+            repo = data.get(f"repo{i}")
+            if repo is None:
+                continue
+            blobs = [repo.get(f"readme{j}") for j in range(len(README_CANDIDATES))]
+            blob = next((blob for blob in blobs if blob), None)
+            if blob is None:
+                # README.MD, docs/README.md, README.adoc, ...: only the REST
+                # endpoint knows every place GitHub looks, so let it decide
+                continue
+            if blob.get("isBinary") or blob.get("text") is None:
+                continue  # Too large to inline; the REST endpoint still serves it
+            details[full_name] = {
+                "readme": blob["text"],
+                "readme_sha": blob["oid"],
+                "description": repo.get("description"),
+                "language": (repo.get("primaryLanguage") or {}).get("name"),
+                "topics": [node["topic"]["name"] for node in (repo.get("repositoryTopics") or {}).get("nodes", [])],
+            }
+        return details
@@ -0,0 +1,132 @@
+# backend/services/http_clients.py
+
+import os
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx only needs it to be importable)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP2_ENABLED = HTTP2_AVAILABLE and os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "64"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "32"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that keeps request counters for pool metrics"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.requests += 1
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+class HTTPClientRegistry:
+    """
+    One pooled httpx.AsyncClient per origin (scheme + host + port), shared
+    by the whole app. Connections are kept alive across requests and, when
+    the h2 package is installed, multiplexed over HTTP/2.
+
+    Created lazily on first use and closed from the FastAPI lifespan hook.
+    Callers must not close the clients they get from here.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _CountingTransport] = {}
+        self._limits: Dict[str, httpx.Limits] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get(self, url: str, limits: Optional[httpx.Limits] = None,
+            timeout: Optional[httpx.Timeout] = None) -> httpx.AsyncClient:
+        """
+        The shared client for the origin of `url`.
+
+        Args:
+            url: Any URL on the target host (only the origin is used)
+            limits / timeout: Pool settings, applied when the client is first created
+        """
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            limits = limits or httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            )
+            transport = _CountingTransport(http2=HTTP2_ENABLED, limits=limits)
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=timeout or httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            )
+            self._clients[origin] = client
+            self._transports[origin] = transport
+            self._limits[origin] = limits
+        return client
+
+    def override(self, url: str, client: httpx.AsyncClient):
+        """
+        Send all traffic for the origin of `url` through `client`, e.g. one
+        mounted on a local fake (see backend/benchmarks/fakes.py). The
+        registry takes ownership and closes it in aclose().
+        """
+        origin = self._origin(url)
+        self._clients[origin] = client
+        self._transports.pop(origin, None)
+        self._limits.pop(origin, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-origin pool utilisation"""
+        stats = {}
+        for origin, transport in self._transports.items():
+            # httpcore does not expose pool state publicly; read it defensively
+            connections = list(getattr(getattr(transport, "_pool", None), "connections", []) or [])
+            active = sum(1 for connection in connections if not connection.is_idle())
+            max_connections = self._limits[origin].max_connections
+            stats[origin] = {
+                "in_flight": transport.in_flight,
+                "requests": transport.requests,
+                "errors": transport.errors,
+                "connections": len(connections),
+                "active_connections": active,
+                "max_connections": max_connections,
+                "utilisation": round(active / max_connections, 4) if max_connections else 0.0,
+                "http2": HTTP2_ENABLED,
+            }
+        return stats
+
+    async def aclose(self):
+        """Close every client. Called on application shutdown."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._transports.clear()
+        self._limits.clear()
+        for client in clients:
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry()
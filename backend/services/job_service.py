@@ -0,0 +1,157 @@
+# backend/services/job_service.py
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+# How long finished jobs (and their results) stay retrievable, in seconds
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "900"))
+# Upper bound on jobs kept in memory; the oldest finished ones go first
+JOB_MAX_JOBS = int(os.getenv("JOB_MAX_JOBS", "1000"))
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[Callable[[int, Dict[str, Any]], None]], Awaitable[Any]]
+
+
+class EnhancementJob:
+    """
+    One background enhancement run.
+
+    Every event is kept in order, so any number of subscribers can replay the
+    stream from the start and then follow it live.
+    """
+
+    def __init__(self, total: int):
+        # Job ids guard access to private repo data, so they must be unguessable
+        self.id = secrets.token_urlsafe(16)
+        self.total = total
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.results: List[Optional[Dict[str, Any]]] = [None] * total
+        self.completed = 0
+        # Repos whose data could not be fetched (see enhancement_service.STATUS_INCOMPLETE)
+        self.incomplete = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._events: List[Dict[str, Any]] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def summary(self) -> Dict[str, Any]:
+        finished = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "incomplete": self.incomplete,
+            "error": self.error,
+            "elapsed_seconds": round(finished - self.created_at, 3),
+        }
+
+    def add_result(self, index: int, repo: Dict[str, Any]):
+        self.results[index] = repo
+        self.completed += 1
+        if repo.get("enhancement_status") == "incomplete":
+            self.incomplete += 1
+        self._emit({"event": "result", "index": index, "repo": repo})
+
+    def finish(self, status: str, error: str = None):
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+        self._emit({"event": "summary", **self.summary()})
+
+    def _emit(self, event: Dict[str, Any]):
+        self._events.append(event)
+        # Wake everyone waiting on the current Event, then arm a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Replay all events so far, then follow new ones until the summary"""
+        cursor = 0
+        while True:
+            changed = self._changed
+            while cursor < len(self._events):
+                event = self._events[cursor]
+                cursor += 1
+                yield event
+                if event["event"] == "summary":
+                    return
+            await changed.wait()
+
+
+class JobManager:
+    """In-memory registry of enhancement jobs for this worker"""
+
+    def __init__(self):
+        self._jobs: Dict[str, EnhancementJob] = {}
+
+    def submit(self, total: int, runner: JobRunner) -> EnhancementJob:
+        """
+        Start a job in the background.
+
+        Args:
+            total: Number of repos the job will report
+            runner: Called with the job's per-result callback; returns the
+                awaitable doing the actual work
+
+        Returns:
+            The running job
+        """
+        self._prune()
+        job = EnhancementJob(total)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, runner))
+        return job
+
+    def get(self, job_id: str) -> Optional[EnhancementJob]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs held, by status"""
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    async def _run(self, job: EnhancementJob, runner: JobRunner):
+        try:
+            await runner(job.add_result)
+            job.finish("completed")
+        except asyncio.CancelledError:
+            job.finish("cancelled")
+            raise
+        except Exception as e:
+            logger.exception("Enhancement job %s failed", job.id)
+            job.finish("failed", str(e))
+
+    def _prune(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.done and now - job.finished_at > JOB_RESULT_TTL:
+                del self._jobs[job_id]
+
+        finished = sorted((job for job in self._jobs.values() if job.done), key=lambda job: job.finished_at)
+        while len(self._jobs) >= JOB_MAX_JOBS and finished:
+            del self._jobs[finished.pop(0).id]
+
+    async def shutdown(self):
+        """Cancel running jobs. Called on application shutdown."""
+        running = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+job_manager = JobManager()
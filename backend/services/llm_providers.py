@@ -0,0 +1,347 @@
+# backend/services/llm_providers.py
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI, BadRequestError
+
+from .http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+DEEPSEEK_MODEL = "deepseek-chat"
+# Gemini is reached through Google's OpenAI-compatible endpoint, so it shares
+# the pooled client path instead of the SDK's process-wide genai.configure()
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+
+# Providers tried for every request, in order of preference until routing
+# stats say otherwise: deepseek, gemini, openai (any compatible endpoint), mock
+LLM_PROVIDERS = [name.strip() for name in os.getenv("LLM_PROVIDERS", "deepseek").split(",") if name.strip()]
+LLM_OPENAI_BASE_URL = os.getenv("LLM_OPENAI_BASE_URL")
+LLM_OPENAI_MODEL = os.getenv("LLM_OPENAI_MODEL", "gpt-4o-mini")
+
+# Connection pool settings for the shared LLM clients
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))  # per API key
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "64"))  # per provider host
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "32"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+# Every user brings their own API key, so cap how many pools we keep around
+LLM_MAX_POOLED_CLIENTS = int(os.getenv("LLM_MAX_POOLED_CLIENTS", "256"))
+
+# Routing: latency and error rate are exponentially weighted moving averages
+LLM_ROUTING_ALPHA = float(os.getenv("LLM_ROUTING_ALPHA", "0.2"))
+# Errors are forgiven over time so a provider that failed gets traffic again
+LLM_ERROR_HALF_LIFE = float(os.getenv("LLM_ERROR_HALF_LIFE", "30"))
+# Send a hedged request to the runner-up after this many seconds: "auto"
+# (twice the primary's typical latency, at least LLM_HEDGE_MIN), a number,
+# or "off"
+LLM_HEDGE_AFTER = os.getenv("LLM_HEDGE_AFTER", "auto")
+LLM_HEDGE_MIN = float(os.getenv("LLM_HEDGE_MIN", "1.0"))
+# Cancellation message the router gives the slower call of a hedge race
+_HEDGE_LOST = "lost hedge race"
+
+
+class Completion:
+    """Text of one chat completion and where it came from"""
+
+    def __init__(self, content: str, finish_reason: Optional[str], provider: str):
+        self.content = content or ""
+        self.finish_reason = finish_reason
+        self.provider = provider
+
+
+class LLMRequestRejected(Exception):
+    """The provider refused the request itself (e.g. over the context limit); retrying elsewhere will not help"""
+
+
+class LLMProvider:
+    """
+    A chat completion backend. Subclasses implement complete(); routing and
+    hedging live in LLMRouter.
+    """
+
+    name = "provider"
+    model = ""
+
+    async def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                       json_output: bool = False) -> Completion:
+        raise NotImplementedError
+
+
+class _PooledClient:
+    """An AsyncOpenAI client plus the semaphore capping its in-flight requests"""
+
+    def __init__(self, api_key: str, base_url: str):
+        # Every API key talks to the provider over the same shared connection
+        # pool; the key only changes the Authorization header
+        http_client = http_clients.get(
+            base_url,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        )
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        self.slots = asyncio.Semaphore(LLM_MAX_IN_FLIGHT)
+        self.in_flight = 0
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any endpoint speaking the OpenAI chat completions API"""
+
+    # Clients live for the lifetime of the app and are shared by every
+    # provider instance with the same API key and base URL. They sit on the
+    # app-wide HTTP pool, so repeated calls reuse warm TLS connections.
+    _pool: "OrderedDict[tuple, _PooledClient]" = OrderedDict()
+
+    def __init__(self, api_key: str, base_url: str, model: str, name: str = "openai"):
+        self.name = name
+        self.base_url = base_url
+        self.model = model
+        self._pooled = self._get_pooled_client(api_key, base_url)
+        self.client = self._pooled.client
+
+    @classmethod
+    def _get_pooled_client(cls, api_key: str, base_url: str) -> _PooledClient:
+        # Never keep raw API keys around as dict keys
+        key = (hashlib.sha256(api_key.encode()).hexdigest(), base_url)
+        pooled = cls._pool.get(key)
+        if pooled is not None:
+            cls._pool.move_to_end(key)
+            return pooled
+
+        pooled = cls._pool[key] = _PooledClient(api_key, base_url)
+        cls._evict_idle_clients()
+        return pooled
+
+    @classmethod
+    def _evict_idle_clients(cls):
+        """Drop least recently used clients that have no requests in flight"""
+        for key in list(cls._pool):
+            if len(cls._pool) <= LLM_MAX_POOLED_CLIENTS:
+                break
+            if cls._pool[key].in_flight == 0:
+                # Nothing to close: the HTTP pool underneath is shared
+                del cls._pool[key]
+
+    @classmethod
+    def reset_pool(cls):
+        """Forget all pooled clients (the HTTP registry closes the connections)"""
+        cls._pool.clear()
+
+    async def complete(self, messages, max_tokens, temperature, json_output=False) -> Completion:
+        kwargs = {}
+        if json_output:
+            kwargs["response_format"] = {"type": "json_object"}
+        # Count waiters too, so a client is never evicted while a call is queued on it
+        self._pooled.in_flight += 1
+        try:
+            async with self._pooled.slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature, **kwargs
+                )
+        except BadRequestError as e:
+            raise LLMRequestRejected(str(e)) from e
+        finally:
+            self._pooled.in_flight -= 1
+        choice = response.choices[0]
+        return Completion(choice.message.content, choice.finish_reason, self.name)
+
+
+class DeepSeekProvider(OpenAICompatibleProvider):
+    def __init__(self, api_key: str, base_url: str = DEEPSEEK_BASE_URL, model: str = DEEPSEEK_MODEL):
+        super().__init__(api_key, base_url, model, name="deepseek")
+
+
+class GeminiProvider(OpenAICompatibleProvider):
+    def __init__(self, api_key: str, base_url: str = GEMINI_BASE_URL, model: str = GEMINI_MODEL):
+        super().__init__(api_key, base_url, model, name="gemini")
+
+
+class ProviderStats:
+    """Moving averages of one provider's latency and error rate"""
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self._error_rate = 0.0
+        self._updated_at = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def error_rate(self) -> float:
+        # Decays while the provider is not used, so it is eventually retried
+        idle = time.monotonic() - self._updated_at
+        return self._error_rate * 0.5 ** (idle / LLM_ERROR_HALF_LIFE)
+
+    def record(self, latency: float, ok: bool):
+        self._error_rate = self.error_rate + LLM_ROUTING_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+        self._updated_at = time.monotonic()
+        self.requests += 1
+        if ok:
+            self.latency = latency if self.latency is None else self.latency + LLM_ROUTING_ALPHA * (latency - self.latency)
+        else:
+            self.errors += 1
+
+    def score(self) -> float:
+        """Expected cost of sending a request here; lower is better"""
+        # Unmeasured providers look fast so they get tried
+        latency = self.latency if self.latency is not None else 0.0
+        return (latency + 0.1) * (1 + 20 * self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "requests": self.requests,
+            "errors": self.errors,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+# Shared by all routers so every user request benefits from what the others
+# observed. Keyed by provider name: health is a property of the endpoint.
+provider_stats: Dict[str, ProviderStats] = {}
+
+
+def _stats_for(provider: LLMProvider) -> ProviderStats:
+    stats = provider_stats.get(provider.name)
+    if stats is None:
+        stats = provider_stats[provider.name] = ProviderStats()
+    return stats
+
+
+class LLMRouter(LLMProvider):
+    """
+    Sends each request to the provider with the best latency/error score.
+
+    When the primary has not answered after the hedge delay, the same request
+    also goes to the runner-up and the first success wins (the other call is
+    cancelled). A primary that fails outright falls over to the runner-up.
+    Hedging trades a few duplicate calls for a much shorter tail.
+    """
+
+    def __init__(self, providers: List[LLMProvider], hedge_after: str = None):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = providers
+        self.hedge_after = hedge_after or LLM_HEDGE_AFTER
+        self.name = "router"
+        # Identifies the model set for cache keys
+        self.model = ",".join(sorted({provider.model for provider in providers}))
+
+    def rank(self) -> List[LLMProvider]:
+        # sorted() is stable, so configuration order breaks ties
+        return sorted(self.providers, key=lambda provider: _stats_for(provider).score())
+
+    def hedge_delay(self, provider: LLMProvider) -> Optional[float]:
+        if self.hedge_after == "off":
+            return None
+        if self.hedge_after != "auto":
+            return float(self.hedge_after)
+        latency = _stats_for(provider).latency
+        return max(2 * latency, LLM_HEDGE_MIN) if latency is not None else LLM_TIMEOUT / 2
+
+    async def _attempt(self, provider: LLMProvider, *args) -> Completion:
+        stats = _stats_for(provider)
+        start = time.perf_counter()
+        try:
+            completion = await provider.complete(*args)
+        except asyncio.CancelledError as e:
+            if e.args == (_HEDGE_LOST,):
+                # Lost a hedge race: at least this slow, which is what routing needs to know
+                stats.record(time.perf_counter() - start, ok=True)
+            # Otherwise the caller gave up, which says nothing about the provider
+            raise
+        except LLMRequestRejected:
+            raise  # The request's fault, not the provider's
+        except Exception:
+            stats.record(time.perf_counter() - start, ok=False)
+            raise
+        stats.record(time.perf_counter() - start, ok=True)
+        return completion
+
+    async def complete(self, messages, max_tokens, temperature, json_output=False) -> Completion:
+        args = (messages, max_tokens, temperature, json_output)
+        ranked = self.rank()
+        primary = asyncio.create_task(self._attempt(ranked[0], *args))
+        tasks = [primary]
+        settled = False
+        try:
+            if len(ranked) == 1:
+                return await primary
+
+            secondary_provider = ranked[1]
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(ranked[0]))
+            if done:
+                error = primary.exception()
+                if error is None:
+                    return primary.result()
+                if isinstance(error, LLMRequestRejected):
+                    raise error
+                logger.warning("LLM provider %s failed (%r), falling back to %s", ranked[0].name, error, secondary_provider.name)
+                return await self._attempt(secondary_provider, *args)
+
+            _stats_for(secondary_provider).hedges += 1
+            secondary = asyncio.create_task(self._attempt(secondary_provider, *args))
+            tasks.append(secondary)
+            pending = {primary, secondary}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        settled = True
+                        if task is secondary:
+                            _stats_for(secondary_provider).hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The losing (or abandoned) call is cancelled, not left running
+            for task in tasks:
+                if not task.done():
+                    task.cancel(_HEDGE_LOST if settled else None)
+
+
+def build_providers(deepseek_api_key: Optional[str] = None) -> List[LLMProvider]:
+    """
+    Providers named in LLM_PROVIDERS that have credentials. The DeepSeek key
+    comes from the user's request, falling back to DEEPSEEK_API_KEY.
+    """
+    providers: List[LLMProvider] = []
+    for name in LLM_PROVIDERS:
+        if name == "deepseek":
+            api_key = deepseek_api_key or os.getenv("DEEPSEEK_API_KEY")
+            if api_key:
+                providers.append(DeepSeekProvider(api_key))
+        elif name == "gemini":
+            api_key = os.getenv("GEMINI_API_KEY")
+            if api_key:
+                providers.append(GeminiProvider(api_key))
+        elif name == "openai":
+            if LLM_OPENAI_BASE_URL:
+                providers.append(OpenAICompatibleProvider(
+                    os.getenv("LLM_OPENAI_API_KEY", "not-needed"), LLM_OPENAI_BASE_URL, LLM_OPENAI_MODEL
+                ))
+        elif name == "mock":
+            from .mock_llm import MockLLMProvider
+            providers.append(MockLLMProvider())
+        else:
+            raise ValueError(f"Unknown LLM provider {name!r} in LLM_PROVIDERS")
+    return providers
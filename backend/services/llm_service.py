@@ -1,40 +1,40 @@
 # backend/services/llm_service.py
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
-from openai import OpenAI
+from typing import List, Optional, Tuple
 
-class DeepSeekService:
-    def __init__(self, api_key: str = None):
-        """Initialize DeepSeek API client"""
-        self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
-        if not self.api_key:
-            raise ValueError("DeepSeek API key not provided")
-        
-        # DeepSeek uses OpenAI-compatible API
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url="https://api.deepseek.com"
-        )
-    
-    def generate_project_description(self, readme_content: str, repo_name: str) -> str:
-        """
-        Generate a concise project description from README content
-        
-        Args:
-            readme_content: The README file content
-            repo_name: Name of the repository
-            
-        Returns:
-            A concise 1-2 sentence project description
-        """
-        try:
-            # Limit content to avoid token limits
-            content_preview = readme_content[:3000]
-            
-            prompt = f"""You are a professional resume writer. Based on the README from a GitHub repository named "{repo_name}", write a concise, impactful 1-2 sentence description for a resume.
+from .cache import LRUCache, SQLiteCache, TieredCache
+from .llm_providers import LLMProvider, LLMRequestRejected, LLMRouter, OpenAICompatibleProvider, build_providers
+from .metrics import stage
+from .readme_service import condense_readme, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Batched mode: several repos per chat completion. Off (1) unless configured.
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "1"))
+# Prompt tokens one batch may use; larger batches are split
+LLM_BATCH_MAX_PROMPT_TOKENS = int(os.getenv("LLM_BATCH_MAX_PROMPT_TOKENS", "6000"))
+# How long a batch waits for more READMEs before it is sent (seconds)
+LLM_BATCH_WINDOW = float(os.getenv("LLM_BATCH_WINDOW", "0.2"))
+# Completion tokens reserved per repo in a batch
+LLM_BATCH_TOKENS_PER_REPO = int(os.getenv("LLM_BATCH_TOKENS_PER_REPO", "160"))
+
+# Description cache: in-memory LRU, plus SQLite when DESCRIPTION_CACHE_PATH is set
+DESCRIPTION_CACHE_SIZE = int(os.getenv("DESCRIPTION_CACHE_SIZE", "10000"))
+DESCRIPTION_CACHE_TTL = float(os.getenv("DESCRIPTION_CACHE_TTL", str(30 * 24 * 3600)))
+DESCRIPTION_CACHE_PATH = os.getenv("DESCRIPTION_CACHE_PATH")
+DESCRIPTION_CACHE_DISK_SIZE = int(os.getenv("DESCRIPTION_CACHE_DISK_SIZE", "200000"))
+
+SYSTEM_PROMPT = "You are a professional resume writer who creates concise, impactful project descriptions. Write clear, direct descriptions without unnecessary preamble."
+
+PROMPT_TEMPLATE = """You are a professional resume writer. Based on the README from a GitHub repository named "{repo_name}", write a concise, impactful 1-2 sentence description for a resume.
 
 README Content:
-{content_preview}
+{readme_content}
 
 Requirements:
 - Focus on WHAT the project does and WHY it's valuable
@@ -48,41 +48,311 @@ Example style: "Full-stack e-commerce platform built with React and Node.js, fea
 
 Your description:"""
 
-            response = self.client.chat.completions.create(
-                model="deepseek-chat",
+BATCH_PROMPT_TEMPLATE = """You are a professional resume writer. Below are READMEs from {count} GitHub repositories. For each one, write a concise, impactful 1-2 sentence description for a resume.
+
+Requirements for every description:
+- Focus on WHAT the project does and WHY it's valuable
+- Mention key technologies/frameworks used
+- Use professional, active language
+- Keep it under 150 words
+- No markdown formatting
+- Start directly with the description (no "This project..." or "This is...")
+
+Example style: "Full-stack e-commerce platform built with React and Node.js, featuring real-time inventory management and payment processing for 10K+ daily transactions."
+
+Answer with JSON only, in the form {{"descriptions": [{{"id": 1, "description": "..."}}, ...]}}, one entry per repository id.
+
+{repos}"""
+
+BATCH_REPO_TEMPLATE = """### Repository {id}: "{repo_name}"
+{readme_content}
+"""
+
+
+def _build_description_cache() -> TieredCache:
+    disk = None
+    if DESCRIPTION_CACHE_PATH:
+        disk = SQLiteCache(
+            DESCRIPTION_CACHE_PATH,
+            max_entries=DESCRIPTION_CACHE_DISK_SIZE,
+            ttl=DESCRIPTION_CACHE_TTL,
+            table="descriptions",
+        )
+    return TieredCache(LRUCache(max_entries=DESCRIPTION_CACHE_SIZE, ttl=DESCRIPTION_CACHE_TTL), disk)
+
+
+# Shared by every DeepSeekService instance. Descriptions do not depend on the
+# caller's API key, so users syncing the same repos share entries.
+description_cache = _build_description_cache()
+
+
+def description_cache_key(readme_content: str, repo_name: str, model: str) -> str:
+    """
+    Content address for a generated description. Any change to the README,
+    the repo name, the prompts or the model produces a new key.
+    """
+    digest = hashlib.sha256()
+    for part in (SYSTEM_PROMPT, PROMPT_TEMPLATE, model, repo_name, readme_content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _clean_description(description: str) -> str:
+    description = description.strip()
+    # Remove quotes if present
+    description = description.strip('"\'')
+    # Remove common prefixes
+    for prefix in ["This project ", "This is ", "This repository ", "A project that "]:
+        if description.startswith(prefix):
+            description = description[len(prefix):]
+            # Capitalize first letter
+            description = description[0].upper() + description[1:]
+    return description
+
+
+def _parse_batch_output(content: str, count: int) -> dict:
+    """{id: description} from a batch answer; ids outside 1..count are ignored"""
+    try:
+        data = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    entries = data.get("descriptions") if isinstance(data, dict) else data
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            repo_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        description = entry.get("description")
+        if 1 <= repo_id <= count and isinstance(description, str) and description.strip():
+            parsed[repo_id] = _clean_description(description)
+    return parsed
+
+
+# (repo name, condensed README, cache key)
+_BatchItem = Tuple[str, str, str]
+
+
+class _DescriptionBatcher:
+    """
+    Coalesces concurrent generate_project_description calls into batches.
+
+    A batch is sent when it holds `max_items` READMEs, when the next README
+    would push it past `max_tokens`, or `window` seconds after its first
+    README arrived, whichever comes first.
+    """
+
+    def __init__(self, send, max_items: int, max_tokens: int, window: float):
+        self._send = send
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.window = window
+        self._pending: List[tuple] = []  # (item, tokens, future)
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def submit(self, item: _BatchItem) -> str:
+        loop = asyncio.get_running_loop()
+        tokens = estimate_tokens(item[1])
+        if self._pending and self._pending_tokens + tokens > self.max_tokens:
+            self._flush()
+        future = loop.create_future()
+        self._pending.append((item, tokens, future))
+        self._pending_tokens += tokens
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]):
+        try:
+            results = await self._send([item for item, _, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            # The caller may have given up (timeout) in the meantime
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class DeepSeekService:
+    """
+    Project descriptions from README content.
+
+    Despite the name, requests go to whichever providers LLM_PROVIDERS lists
+    (see llm_providers): DeepSeek with the caller's key by default, plus
+    Gemini, any OpenAI-compatible endpoint or the local mock, routed by
+    latency and error rate with hedging.
+    """
+
+    def __init__(self, api_key: str = None, cache: TieredCache = None, batch_size: int = None,
+                 provider: LLMProvider = None):
+        """
+        Initialize the LLM providers.
+
+        With batch_size > 1 (default LLM_BATCH_SIZE), concurrent
+        generate_project_description calls are packed into shared requests.
+        An explicit `provider` replaces the configured ones.
+        """
+        self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
+        if provider is None:
+            providers = build_providers(self.api_key)
+            if not providers:
+                raise ValueError("DeepSeek API key not provided")
+            provider = providers[0] if len(providers) == 1 else LLMRouter(providers)
+        self.provider = provider
+        self.model = provider.model
+        self.cache = cache or description_cache
+        self.batch_size = batch_size if batch_size is not None else LLM_BATCH_SIZE
+        self._batcher = None
+        if self.batch_size > 1:
+            self._batcher = _DescriptionBatcher(
+                self._describe_batch, self.batch_size, LLM_BATCH_MAX_PROMPT_TOKENS, LLM_BATCH_WINDOW
+            )
+
+    @staticmethod
+    def reset_pool():
+        """Forget all pooled clients (the HTTP registry closes the connections)"""
+        OpenAICompatibleProvider.reset_pool()
+
+    async def generate_project_description(self, readme_content: str, repo_name: str) -> str:
+        """
+        Generate a concise project description from README content
+        
+        Args:
+            readme_content: The README file content
+            repo_name: Name of the repository
+            
+        Returns:
+            A concise 1-2 sentence project description (empty if the model
+            gave nothing usable). Results are cached by content, so an
+            unchanged README never triggers a second LLM call.
+
+        Raises:
+            Exception: whatever the provider raised; callers keep the
+                original description rather than a placeholder
+        """
+        # Only the sections that describe the project, within the token budget
+        content_preview = condense_readme(readme_content)
+        cache_key = description_cache_key(content_preview, repo_name, self.model)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if self._batcher is not None:
+            return await self._batcher.submit((repo_name, content_preview, cache_key))
+        return await self._describe_one(repo_name, content_preview, cache_key)
+
+    async def _describe_one(self, repo_name: str, content_preview: str, cache_key: str) -> str:
+        prompt = PROMPT_TEMPLATE.format(repo_name=repo_name, readme_content=content_preview)
+
+        with stage("llm_call", batch_size=1):
+            completion = await self.provider.complete(
                 messages=[
-                    {"role": "system", "content": "You are a professional resume writer who creates concise, impactful project descriptions. Write clear, direct descriptions without unnecessary preamble."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=200,
                 temperature=0.7
             )
-            
-            description = response.choices[0].message.content.strip()
-            # Remove quotes if present
-            description = description.strip('"\'')
-            # Remove common prefixes
-            for prefix in ["This project ", "This is ", "This repository ", "A project that "]:
-                if description.startswith(prefix):
-                    description = description[len(prefix):]
-                    # Capitalize first letter
-                    description = description[0].upper() + description[1:]
-            
-            return description
-            
+
+        description = _clean_description(completion.content)
+
+        # Only real model output is cached
+        if description:
+            self.cache.set(cache_key, description)
+        return description
+
+    async def _describe_batch(self, items: List[_BatchItem]) -> List[str]:
+        """
+        Describe several repos with one request. Halves the batch when the
+        provider rejects it or the answer is cut off; any repo missing from
+        the JSON answer gets its own request.
+
+        Returns:
+            One entry per item: its description, or the exception its
+            single request failed with
+        """
+        if len(items) == 1:
+            return list(await asyncio.gather(self._describe_one(*items[0]), return_exceptions=True))
+
+        repos = "\n".join(
+            BATCH_REPO_TEMPLATE.format(id=number, repo_name=name, readme_content=preview)
+            for number, (name, preview, _) in enumerate(items, 1)
+        )
+        prompt = BATCH_PROMPT_TEMPLATE.format(count=len(items), repos=repos)
+        try:
+            with stage("llm_call", batch_size=len(items)):
+                completion = await self.provider.complete(
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=LLM_BATCH_TOKENS_PER_REPO * len(items) + 50,
+                    temperature=0.7,
+                    json_output=True,
+                )
+            truncated = completion.finish_reason == "length"
+            parsed = {} if truncated else _parse_batch_output(completion.content, len(items))
+        except LLMRequestRejected as e:
+            # Usually the context limit: smaller batches will fit
+            logger.warning("Batch of %d descriptions rejected, splitting: %s", len(items), e)
+            truncated, parsed = True, {}
         except Exception as e:
-            print(f"Error generating description: {e}")
-            import traceback
-            traceback.print_exc()
-            return f"GitHub project: {repo_name}"
+            logger.warning("Batch of %d descriptions failed, falling back to single requests: %s", len(items), e)
+            truncated, parsed = False, {}
+
+        if truncated:
+            middle = len(items) // 2
+            halves = await asyncio.gather(self._describe_batch(items[:middle]), self._describe_batch(items[middle:]))
+            return halves[0] + halves[1]
+
+        missing = [number for number in range(1, len(items) + 1) if number not in parsed]
+        if missing:
+            logger.warning("Batch answer covered %d/%d repos, requesting the rest one by one", len(parsed), len(items))
+            singles = await asyncio.gather(
+                *(self._describe_one(*items[number - 1]) for number in missing), return_exceptions=True
+            )
+            parsed.update(zip(missing, singles))
+        else:
+            logger.debug("Described %d repos in one request", len(items))
+
+        results = []
+        for number, (_, _, cache_key) in enumerate(items, 1):
+            if number not in missing and parsed[number]:
+                self.cache.set(cache_key, parsed[number])
+            results.append(parsed[number])
+        return results
     
-    def enhance_project_descriptions(self, projects: list, readme_fetcher) -> list:
+    async def enhance_project_descriptions(self, projects: list, readme_fetcher) -> list:
         """
         Enhance projects with AI-generated descriptions where missing
         
         Args:
             projects: List of project dictionaries
-            readme_fetcher: Function to fetch README content
+            readme_fetcher: Async function to fetch README content
             
         Returns:
             Enhanced projects list
@@ -91,11 +361,14 @@ Your description:"""
         for project in projects:
             if not project.get('description') or project.get('description') == '':
                 # Fetch README and generate description
-                readme = readme_fetcher(project['full_name'])
+                readme = await readme_fetcher(project['full_name'])
                 if readme:
-                    project['description'] = self.generate_project_description(
-                        readme, 
-                        project['name']
-                    )
+                    try:
+                        project['description'] = await self.generate_project_description(
+                            readme,
+                            project['name']
+                        ) or project.get('description')
+                    except Exception:
+                        logger.exception("Error generating description for %s", project['name'])
             enhanced.append(project)
         return enhanced
@@ -0,0 +1,38 @@
+# backend/services/logging_config.py
+
+import logging
+import os
+import random
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Fraction of DEBUG/INFO records kept; warnings and errors are always logged
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_FORMAT = os.getenv("LOG_FORMAT", "%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a random `rate` fraction of records below WARNING"""
+
+    def __init__(self, rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.rate >= 1.0 or random.random() < self.rate
+
+
+def configure_logging(level: str = LOG_LEVEL, sample_rate: float = LOG_SAMPLE_RATE) -> logging.Logger:
+    """
+    Attach one stderr handler to the `backend` package logger. Safe to call
+    more than once; uvicorn's own loggers are left alone.
+    """
+    logger = logging.getLogger(__package__.split(".")[0])
+    logger.setLevel(level)
+    if not any(getattr(handler, "_codefolio", False) for handler in logger.handlers):
+        handler = logging.StreamHandler()
+        handler._codefolio = True
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler.addFilter(SamplingFilter(sample_rate))
+        logger.addHandler(handler)
+        logger.propagate = False
+    return logger
@@ -0,0 +1,254 @@
+# backend/services/metrics.py
+
+import bisect
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+try:
+    from opentelemetry import trace
+    # A no-op tracer unless an OpenTelemetry SDK/exporter is configured
+    _tracer = trace.get_tracer("codefolio")
+except ImportError:
+    _tracer = None
+
+TRACING_ENABLED = _tracer is not None and os.getenv("OTEL_TRACING", "true").lower() in ("1", "true", "yes")
+
+# Seconds; covers a cache hit (sub-millisecond) up to a slow LLM call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, labels, value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus expects"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, list] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                yield self.name + "_bucket", labels + (("le", _format_value(float(bound))),), cumulative
+            yield self.name + "_sum", labels, series[-2]
+            yield self.name + "_count", labels, series[-1]
+
+
+class CallbackMetric:
+    """
+    Values read at scrape time from a callback returning [(labels dict, value)],
+    for state other modules already keep (cache stats, pool sizes, ...)
+    """
+
+    def __init__(self, name: str, help: str, collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+                 kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.collect = collect
+        self.kind = kind
+
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        for labels, value in self.collect():
+            if value is not None:
+                yield self.name, tuple(sorted(labels.items())), value
+
+
+class MetricsRegistry:
+    """Every metric of this process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self.register(Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, buckets))
+
+    def callback(self, name: str, help: str, collect, kind: str = "gauge") -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, collect, kind))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception as e:  # A broken collector must not take /metrics down
+                lines.append(f"# {metric.name} collection failed: {e!r}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+stage_seconds = registry.histogram(
+    "codefolio_stage_seconds",
+    "Time spent per processing stage (github_fetch, readme_fetch, llm_call, jinja_render, weasyprint_layout, pdf_write, ...)",
+)
+stage_errors = registry.counter("codefolio_stage_errors_total", "Stages that raised")
+http_request_seconds = registry.histogram("codefolio_http_request_seconds", "API request latency by route")
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """
+    Time a stage of request processing. Works in sync and async code. Also
+    opens an OpenTelemetry span when the API package is installed.
+
+        with stage("jinja_render", template=name):
+            ...
+    """
+    with ExitStack() as stack:
+        span = None
+        if TRACING_ENABLED:
+            span = stack.enter_context(_tracer.start_as_current_span(name, attributes=attributes))
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            stage_errors.inc(stage=name)
+            raise
+        finally:
+            stage_seconds.observe(time.perf_counter() - start, stage=name)
+
+
+def record_stage(name: str, seconds: float):
+    """Record a stage timed elsewhere, e.g. inside a render worker process"""
+    stage_seconds.observe(seconds, stage=name)
+
+
+def register_service_collectors():
+    """
+    Expose state the services already track: cache hit rates, outbound pool
+    utilisation, render queue depth, LLM provider health and job counts.
+    Called once by the app; imports are local because those services
+    themselves import this module.
+    """
+    from .github_service import response_store
+    from .gdocs_service import gdoc_cache
+    from .http_clients import http_clients
+    from .job_service import job_manager
+    from .llm_providers import provider_stats
+    from .llm_service import description_cache
+    from .render_service import pdf_cache, render_pool
+
+    caches = {
+        "llm_descriptions": description_cache,
+        "github_responses": response_store,
+        "google_docs": gdoc_cache,
+        "pdf": pdf_cache,
+    }
+
+    def cache_requests():
+        for name, cache in caches.items():
+            yield {"cache": name, "result": "hit"}, cache.stats.hits
+            yield {"cache": name, "result": "miss"}, cache.stats.misses
+
+    registry.callback("codefolio_cache_requests_total", "Cache lookups by outcome", cache_requests, kind="counter")
+    registry.callback(
+        "codefolio_cache_hit_ratio", "Hits over lookups since start",
+        lambda: (({"cache": name}, cache.stats.hit_rate) for name, cache in caches.items()),
+    )
+    registry.callback(
+        "codefolio_cache_evictions_total", "Entries evicted for space",
+        lambda: (({"cache": name}, cache.stats.evictions) for name, cache in caches.items()), kind="counter",
+    )
+
+    def pool_stat(key):
+        return lambda: (({"origin": origin}, stats[key]) for origin, stats in http_clients.stats().items())
+
+    registry.callback("codefolio_http_pool_in_flight", "Outbound requests in flight", pool_stat("in_flight"))
+    registry.callback("codefolio_http_pool_active_connections", "Busy pooled connections", pool_stat("active_connections"))
+    registry.callback("codefolio_http_pool_max_connections", "Pool size limit", pool_stat("max_connections"))
+    registry.callback("codefolio_http_pool_utilisation", "Busy connections over the pool limit", pool_stat("utilisation"))
+    registry.callback("codefolio_http_pool_errors_total", "Outbound transport errors", pool_stat("errors"), kind="counter")
+
+    def render_stat(key):
+        return lambda: [({}, render_pool.stats()[key])]
+
+    registry.callback("codefolio_render_workers", "PDF render worker processes", render_stat("workers"))
+    registry.callback("codefolio_render_in_flight", "Renders running in a worker", render_stat("running"))
+    registry.callback("codefolio_render_queue_depth", "Renders waiting for a free worker", render_stat("queued"))
+
+    def provider_stat(attribute):
+        return lambda: (({"provider": name}, getattr(stats, attribute)) for name, stats in provider_stats.items())
+
+    registry.callback("codefolio_llm_provider_latency_seconds", "Moving-average LLM latency", provider_stat("latency"))
+    registry.callback("codefolio_llm_provider_error_rate", "Decaying LLM error rate", provider_stat("error_rate"))
+    registry.callback("codefolio_llm_provider_requests_total", "LLM requests sent", provider_stat("requests"), kind="counter")
+    registry.callback("codefolio_llm_provider_hedges_total", "Hedged LLM requests", provider_stat("hedges"), kind="counter")
+
+    registry.callback(
+        "codefolio_enhancement_jobs", "Enhancement jobs held in memory, by status",
+        lambda: (({"status": status}, count) for status, count in job_manager.stats().items()),
+    )
@@ -0,0 +1,148 @@
+# backend/services/mock_llm.py
+"""
+Deterministic stand-in for an LLM provider, for offline load tests.
+
+Used in-process as the "mock" provider (LLM_PROVIDERS=mock), or served over
+HTTP as an OpenAI-compatible endpoint:
+
+    python -m backend.services.mock_llm --port 8090 --latency 0.8 --jitter 0.4
+    LLM_PROVIDERS=openai LLM_OPENAI_BASE_URL=http://127.0.0.1:8090/v1 uvicorn backend.main:app
+
+Answers are derived from the prompt only, so the same README always gets the
+same description. Latency and failures come from a seeded RNG.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import Dict, List
+
+from .llm_providers import Completion, LLMProvider
+from .readme_service import estimate_tokens
+
+LLM_MOCK_LATENCY = float(os.getenv("LLM_MOCK_LATENCY", "0.5"))
+LLM_MOCK_JITTER = float(os.getenv("LLM_MOCK_JITTER", "0.25"))
+# Extra seconds per prompt token, so bigger prompts take longer like the real thing
+LLM_MOCK_LATENCY_PER_TOKEN = float(os.getenv("LLM_MOCK_LATENCY_PER_TOKEN", "0.0002"))
+LLM_MOCK_ERROR_RATE = float(os.getenv("LLM_MOCK_ERROR_RATE", "0"))
+LLM_MOCK_SEED = int(os.getenv("LLM_MOCK_SEED", "0"))
+
+_SINGLE_RE = re.compile(r'repository named "([^"]*)".*?README Content:\n(.*?)\n\nRequirements:', re.S)
+_BATCH_RE = re.compile(r'^### Repository (\d+): "([^"]*)"\n(.*?)(?=^### Repository |\Z)', re.S | re.M)
+
+
+class MockLLMError(Exception):
+    """Injected failure"""
+
+
+def _describe(repo_name: str, readme: str) -> str:
+    # The README's first sentence, trimmed; stable for a given input
+    words = re.sub(r"\s+", " ", readme).strip().split(" ")
+    sentence = " ".join(words[:30]).split(". ")[0].rstrip(".")
+    if len(sentence) < 20:
+        sentence = f"Software project {repo_name} with a documented codebase"
+    return f"{sentence}."
+
+
+def mock_completion_text(messages: List[Dict[str, str]], json_output: bool = False) -> str:
+    """Answer for the description prompts in llm_service (single or batched)"""
+    prompt = messages[-1]["content"]
+    batch = _BATCH_RE.findall(prompt)
+    if batch or json_output:
+        return json.dumps({"descriptions": [
+            {"id": int(number), "description": _describe(name, readme)} for number, name, readme in batch
+        ]})
+    match = _SINGLE_RE.search(prompt)
+    if match is None:
+        return _describe("", prompt)
+    return _describe(match.group(1), match.group(2))
+
+
+class MockLatencyModel:
+    """Seeded latency and failure injection shared by the provider and the server"""
+
+    def __init__(self, latency: float = None, jitter: float = None, per_token: float = None,
+                 error_rate: float = None, seed: int = None):
+        self.latency = LLM_MOCK_LATENCY if latency is None else latency
+        self.jitter = LLM_MOCK_JITTER if jitter is None else jitter
+        self.per_token = LLM_MOCK_LATENCY_PER_TOKEN if per_token is None else per_token
+        self.error_rate = LLM_MOCK_ERROR_RATE if error_rate is None else error_rate
+        self._rng = random.Random(LLM_MOCK_SEED if seed is None else seed)
+
+    def draw(self, messages: List[Dict[str, str]]) -> tuple:
+        """(seconds to wait, whether this call fails)"""
+        tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        delay = self.latency + self.per_token * tokens + self.jitter * self._rng.random()
+        return delay, self._rng.random() < self.error_rate
+
+
+class MockLLMProvider(LLMProvider):
+    """In-process mock provider; no network involved"""
+
+    def __init__(self, name: str = "mock", model: str = "mock-1", **latency):
+        self.name = name
+        self.model = model
+        self.timing = MockLatencyModel(**latency)
+
+    async def complete(self, messages, max_tokens, temperature, json_output=False) -> Completion:
+        delay, fail = self.timing.draw(messages)
+        await asyncio.sleep(delay)
+        if fail:
+            raise MockLLMError(f"{self.name}: injected failure")
+        return Completion(mock_completion_text(messages, json_output), "stop", self.name)
+
+
+def create_mock_llm_app(**latency):
+    """
+    OpenAI-compatible FastAPI app answering POST /v1/chat/completions (and
+    /chat/completions, the path DeepSeek-style base URLs produce)
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    app = FastAPI(title="Mock LLM")
+    timing = MockLatencyModel(**latency)
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        delay, fail = timing.draw(messages)
+        await asyncio.sleep(delay)
+        if fail:
+            return JSONResponse({"error": {"message": "injected failure", "type": "server_error"}}, status_code=500)
+        json_output = (body.get("response_format") or {}).get("type") == "json_object"
+        content = mock_completion_text(messages, json_output)
+        return {
+            "id": f"mock-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock-1"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the mock LLM over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=LLM_MOCK_LATENCY)
+    parser.add_argument("--jitter", type=float, default=LLM_MOCK_JITTER)
+    parser.add_argument("--error-rate", type=float, default=LLM_MOCK_ERROR_RATE)
+    parser.add_argument("--seed", type=int, default=LLM_MOCK_SEED)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_mock_llm_app(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed),
+        host=args.host,
+        port=args.port,
+    )
@@ -0,0 +1,193 @@
+# backend/services/readme_service.py
+
+import math
+import os
+import re
+from typing import List, Tuple
+
+# cl100k encoder, loaded on first use (it may have to download its BPE file);
+# False once it turned out to be unavailable
+_encoding = None
+
+# Token budget for the README part of a description prompt
+README_TOKEN_BUDGET = int(os.getenv("README_TOKEN_BUDGET", "600"))
+# READMEs are cut to this many characters before any parsing
+README_MAX_CHARS = int(os.getenv("README_MAX_CHARS", "200000"))
+
+# Section headings that describe the project, most useful first
+_RELEVANT_HEADINGS = (
+    ("about", "overview", "introduction", "description", "what is", "summary", "motivation", "why"),
+    ("features", "highlights", "key features", "architecture", "how it works", "design"),
+    ("tech stack", "technologies", "built with", "stack", "tools", "demo", "screenshots", "usage", "examples"),
+)
+# Sections that never help describe the project
+_NOISE_HEADINGS = (
+    "install", "setup", "set up", "getting started", "quick start", "quickstart", "prerequisite",
+    "requirement", "dependencies", "license", "licence", "contribut", "acknowledg", "credit",
+    "changelog", "change log", "release", "roadmap", "todo", "faq", "support", "sponsor", "donat",
+    "author", "maintainer", "contact", "table of contents", "contents", "toc", "test", "deploy",
+    "build", "development", "running", "run locally", "environment", "configuration", "troubleshoot",
+    "citation", "code of conduct", "security", "badges", "star history",
+)
+
+_RELEVANT_RES = [re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + ")") for keywords in _RELEVANT_HEADINGS]
+_NOISE_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, _NOISE_HEADINGS)) + ")")
+
+# Removed before sections are split, so '#' lines inside code are not headings
+_BLOCK_PATTERNS = [
+    (re.compile(r"<!--.*?-->", re.S), ""),
+    (re.compile(r"^ {0,3}(```|~~~).*?^ {0,3}\1[^\n]*$", re.S | re.M), ""),  # Fenced code blocks
+]
+_NOISE_PATTERNS = _BLOCK_PATTERNS + [
+    (re.compile(r"\[!\[[^\]]*\]\([^)]*\)\]\([^)]*\)"), ""),  # Linked badges
+    (re.compile(r"!\[[^\]]*\]\([^)]*\)"), ""),  # Images
+    (re.compile(r"!\[[^\]]*\]\[[^\]]*\]"), ""),  # Reference images
+    (re.compile(r"^\s*\[[^\]]+\]:\s*\S+.*$", re.M), ""),  # Link reference definitions
+    (re.compile(r"<(img|br|hr|source|video|picture)\b[^>]*>", re.I), ""),
+    (re.compile(r"</?[a-zA-Z][^>]*>"), ""),  # Remaining HTML tags, keep their text
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),  # Links -> link text
+    (re.compile(r"\[([^\]]+)\]\[[^\]]*\]"), r"\1"),
+    (re.compile(r"https?://\S+"), ""),
+    (re.compile(r"`([^`\n]+)`"), r"\1"),
+    # Emphasis markers only where they cannot be part of an identifier or
+    # arithmetic (my_pkg.__init__, 2*3*4); "_" only around phrases
+    (re.compile(r"(?<![\w*])(\*\*|\*)(?=[^\s*])(.+?)(?<=[^\s*])\1(?![\w*])"), r"\2"),
+    (re.compile(r"(?<![\w.])(__|_)(?=[^\s_])([^_\n]*\s[^_\n]*?)(?<=[^\s_])\1(?!\w)"), r"\2"),
+    (re.compile(r"(?<!\w)~~(?=\S)(.+?)(?<=\S)~~"), r"\1"),
+    (re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$", re.M), ""),  # Table rules
+    (re.compile(r"^ {0,3}(?:[-*_] *){3,}$", re.M), ""),  # Horizontal rules
+    (re.compile(r"^\s*>\s?", re.M), ""),
+    (re.compile(r"^ {0,3}#{1,6}\s+", re.M), ""),  # Heading markers (only left in the fallback)
+    (re.compile(r"^( {4}|\t).*$", re.M), ""),  # Indented code
+    (re.compile(r"[ \t]+"), " "),
+    (re.compile(r"\n\s*\n(\s*\n)+"), "\n\n"),
+]
+_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)\s*#*\s*$|^(.+)\n(=+|-+)\s*$", re.M)
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:  # Not installed, or the encoding file cannot be loaded offline
+            _encoding = False
+    return _encoding or None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count of `text`. Exact for OpenAI-style BPE when tiktoken is
+    installed; otherwise a word/punctuation estimate that tracks cl100k
+    within ~10% on English prose (long words split every ~4 characters).
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_RE.findall(text))
+
+
+def strip_markdown_noise(markdown: str) -> str:
+    """Drop code, images, badges, HTML and link targets, keeping the prose"""
+    text = markdown.replace("\r\n", "\n")
+    for pattern, replacement in _NOISE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def _split_sections(markdown: str) -> List[Tuple[str, int, str]]:
+    """
+    (heading, level, body) triples in document order. The text before the
+    first heading comes first with heading '' and level 0.
+    """
+    sections = []
+    heading, level, start = "", 0, 0
+    for match in _HEADING_RE.finditer(markdown):
+        sections.append((heading, level, markdown[start:match.start()]))
+        if match.group(1):
+            heading, level = match.group(2), len(match.group(1))
+        else:
+            heading, level = match.group(3).strip(), 1 if match.group(4)[0] == "=" else 2
+        start = match.end()
+    sections.append((heading, level, markdown[start:]))
+    return sections
+
+
+def _score(heading: str, level: int, index: int) -> float:
+    """Relevance of a section for describing the project; <= 0 means drop it"""
+    if index == 0 or (index == 1 and level == 1):
+        return 10.0  # The intro under the title is almost always the description
+    heading = heading.lower()
+    for tier, pattern in enumerate(_RELEVANT_RES):
+        if pattern.search(heading):
+            return 8.0 - 2 * tier
+    if _NOISE_RE.search(heading):
+        return 0.0
+    # Unknown sections: earlier ones tend to matter more
+    return max(3.0 - 0.25 * index, 0.5)
+
+
+def _truncate_to_budget(text: str, budget: int) -> str:
+    """Cut at the last sentence (or word) boundary that fits `budget` tokens"""
+    if estimate_tokens(text) <= budget:
+        return text
+    # Binary search the character cut, then back off to a clean boundary
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    sentence_end = max(cut.rfind(". "), cut.rfind(".\n"), cut.rfind("\n\n"))
+    if sentence_end > len(cut) // 2:
+        return cut[:sentence_end + 1].rstrip()
+    return cut.rsplit(" ", 1)[0].rstrip()
+
+
+def condense_readme(readme: str, budget: int = README_TOKEN_BUDGET) -> str:
+    """
+    Reduce a README to the parts that describe the project, within `budget`
+    tokens.
+
+    Markdown noise is stripped and sections are ranked by heading (intro and
+    About/Features first, Installation/License/Contributing dropped). The
+    best sections are packed into the budget and emitted in their original
+    order; the last one that only partly fits is cut at a sentence boundary.
+    """
+    markdown = readme[:README_MAX_CHARS].replace("\r\n", "\n")
+    for pattern, replacement in _BLOCK_PATTERNS:
+        markdown = pattern.sub(replacement, markdown)
+
+    sections = []
+    for index, (heading, level, body) in enumerate(_split_sections(markdown)):
+        score = _score(heading, level, index)
+        body = strip_markdown_noise(body)
+        if score <= 0 or not body:
+            continue
+        text = f"{strip_markdown_noise(heading)}\n{body}" if heading else body
+        sections.append((score, index, text))
+
+    if not sections:
+        # Nothing but noise (e.g. a README that is all install steps): fall
+        # back to the cleaned text so the model still gets something, or to
+        # the raw README when cleaning leaves nothing (only code or badges)
+        fallback = strip_markdown_noise(markdown) or readme[:README_MAX_CHARS].strip()
+        return _truncate_to_budget(fallback, budget)
+
+    chosen = []
+    remaining = budget
+    for score, index, text in sorted(sections, key=lambda section: (-section[0], section[1])):
+        tokens = estimate_tokens(text) + 1  # + the separating blank line
+        if tokens <= remaining:
+            chosen.append((index, text))
+            remaining -= tokens
+        elif remaining > 40 or not chosen:
+            chosen.append((index, _truncate_to_budget(text, remaining - 1)))
+            remaining = 0
+        if remaining <= 0:
+            break
+    return "\n\n".join(text for _, text in sorted(chosen)).strip()
@@ -0,0 +1,278 @@
+# backend/services/render_service.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+from weasyprint.urls import path2url
+
+from .asset_service import STATIC_DIR, LocalAssetFetcher, assets_version, font_face_css
+from .cache import LRUCache
+from .metrics import record_stage, stage
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# Templates are only re-checked on disk when this is on (useful while editing them)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() in ("1", "true", "yes")
+# Compiled template bytecode survives restarts here
+JINJA_BYTECODE_CACHE_DIR = os.getenv(
+    "JINJA_BYTECODE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "codefolio-jinja-cache")
+)
+# Rendered PDFs kept in memory, bounded by total size
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+PDF_CACHE_ENTRIES = int(os.getenv("PDF_CACHE_ENTRIES", "2000"))
+
+# PDF rendering process pool
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 2)))
+# Renders allowed to be queued or running at once before answering 503
+RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", str(4 * RENDER_WORKERS)))
+# Seconds a render may take, including time spent queued
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "60"))
+RENDER_RETRY_AFTER = int(os.getenv("RENDER_RETRY_AFTER", "5"))
+# Recycle workers periodically so WeasyPrint memory growth stays bounded
+RENDER_MAX_TASKS_PER_CHILD = int(os.getenv("RENDER_MAX_TASKS_PER_CHILD", "200"))
+
+# Bump whenever the HTML -> PDF step changes in a way that alters the output
+RENDERER_VERSION = "2"
+# Workers load the vendored fonts once, so the set in use is fixed per process
+ASSETS_VERSION = assets_version()
+
+os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    bytecode_cache=FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR),
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+)
+
+pdf_cache = LRUCache(max_entries=PDF_CACHE_ENTRIES, max_bytes=PDF_CACHE_MAX_BYTES, sizeof=len)
+
+_template_versions: Dict[str, tuple] = {}  # template name -> (version hash, uptodate callable)
+
+
+def template_name_for(resume_dict: Dict[str, Any]) -> str:
+    return (resume_dict.get("template") or "resume_modern") + ".html"
+
+
+def template_version(template_name: str) -> str:
+    """Hash of the template source, recomputed only if it may have changed on disk"""
+    cached = _template_versions.get(template_name)
+    if cached is not None and (not TEMPLATE_AUTO_RELOAD or cached[1]()):
+        return cached[0]
+    source, _, uptodate = env.loader.get_source(env, template_name)
+    version = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    _template_versions[template_name] = (version, uptodate or (lambda: True))
+    return version
+
+
+def resume_cache_key(resume_dict: Dict[str, Any]) -> str:
+    """
+    Canonical hash of a resume: same data + same template source + same
+    renderer version + same vendored fonts always gives the same key,
+    regardless of key order.
+    """
+    canonical = json.dumps(resume_dict, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.sha256()
+    digest.update(canonical.encode("utf-8"))
+    digest.update(template_version(template_name_for(resume_dict)).encode())
+    digest.update(RENDERER_VERSION.encode())
+    digest.update(ASSETS_VERSION.encode())
+    return digest.hexdigest()
+
+
+def render_html(resume_dict: Dict[str, Any]) -> str:
+    """Render the resume's Jinja template to an HTML string"""
+    name = template_name_for(resume_dict)
+    with stage("jinja_render", template=name):
+        return env.get_template(name).render(resume_dict)
+
+
+# Per-process render resources, built once and reused by every render
+_render_resources: Optional[tuple] = None
+
+
+def _get_render_resources() -> tuple:
+    """The asset fetcher, FontConfiguration and pre-parsed shared stylesheets"""
+    global _render_resources
+    if _render_resources is None:
+        fetcher = LocalAssetFetcher()
+        font_config = FontConfiguration()
+        fonts_css = CSS(
+            string=font_face_css(),
+            base_url=path2url(STATIC_DIR + os.sep),
+            font_config=font_config,
+            url_fetcher=fetcher,
+        )
+        _render_resources = (fetcher, font_config, [fonts_css])
+    return _render_resources
+
+
+def render_pdf_timed(html_content: str) -> Tuple[bytes, float, float]:
+    """
+    Lay out and write the PDF with WeasyPrint (CPU bound, runs in a pool worker).
+
+    Returns:
+        (PDF bytes, layout seconds, PDF write seconds); the timings travel
+        back to the parent process, which owns the metrics
+    """
+    fetcher, font_config, stylesheets = _get_render_resources()
+    start = time.perf_counter()
+    document = HTML(string=html_content, base_url=STATIC_DIR + os.sep, url_fetcher=fetcher).render(
+        stylesheets=stylesheets, font_config=font_config
+    )
+    laid_out = time.perf_counter()
+    pdf_bytes = document.write_pdf()
+    return pdf_bytes, laid_out - start, time.perf_counter() - laid_out
+
+
+def render_pdf(html_content: str) -> bytes:
+    """Lay out and write the PDF with WeasyPrint"""
+    return render_pdf_timed(html_content)[0]
+
+
+def _warm_worker():
+    """Pool initializer: pay for WeasyPrint/Pango, fonts and shared CSS up front"""
+    render_pdf("<html><body><p>warm-up</p></body></html>")
+
+
+class RenderQueueFull(Exception):
+    """Too many renders are queued; the client should retry later"""
+
+    def __init__(self, retry_after: int = RENDER_RETRY_AFTER):
+        super().__init__("PDF render queue is full")
+        self.retry_after = retry_after
+
+
+class RenderTimeout(Exception):
+    """A render did not finish within RENDER_TIMEOUT"""
+
+
+class RenderPool:
+    """
+    Runs WeasyPrint in a pool of warm worker processes.
+
+    Rendering is CPU bound, so doing it in the event loop would stall every
+    other endpoint. The pool bounds the number of renders queued or running
+    (RenderQueueFull beyond that) and applies a per-render timeout.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS, queue_size: int = RENDER_QUEUE_SIZE,
+                 timeout: float = RENDER_TIMEOUT):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Create the pool and start every worker now rather than on first request"""
+        if self._executor is not None:
+            return
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            max_tasks_per_child=RENDER_MAX_TASKS_PER_CHILD,
+        )
+        for _ in range(self.workers):
+            self._executor.submit(int)
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Replace a broken executor, unless a concurrent render already did"""
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.start()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, executor: ProcessPoolExecutor, html_content: str) -> "asyncio.Future":
+        """
+        Hand one render to the pool. It counts as pending until the worker
+        is done with it, not until the caller stops waiting: a render that
+        timed out still occupies its worker.
+        """
+        job = executor.submit(render_pdf_timed, html_content)  # Raises once the pool is known to be broken
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+
+        def finished(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                pass  # The event loop is already closed (shutdown)
+
+        job.add_done_callback(finished)
+        return asyncio.wrap_future(job)
+
+    def _release(self):
+        self.pending -= 1
+
+    async def render(self, html_content: str) -> bytes:
+        """
+        Render HTML to PDF in a worker process.
+
+        If a worker died (OOM kill, crash in Pango) the pool is broken for
+        good, so it is replaced and the render retried once.
+
+        Raises:
+            RenderQueueFull: if RENDER_QUEUE_SIZE renders are already pending
+            RenderTimeout: if the render takes longer than the timeout
+            BrokenProcessPool: if the render kills a fresh pool too
+        """
+        if self.pending >= self.queue_size:
+            raise RenderQueueFull()
+        self.start()
+        start = time.perf_counter()
+        try:
+            for attempt in range(2):
+                executor = self._executor
+                try:
+                    future = self._submit(executor, html_content)
+                    remaining = self.timeout - (time.perf_counter() - start)
+                    pdf_bytes, layout_seconds, write_seconds = await asyncio.wait_for(future, remaining)
+                    break
+                except BrokenProcessPool:
+                    if attempt:
+                        raise
+                    logger.warning("PDF render pool broke (a worker died), restarting it")
+                    self._restart(executor)
+        except asyncio.TimeoutError:
+            # A render that already started cannot be interrupted; it stays
+            # pending until its worker finishes it (or is recycled)
+            raise RenderTimeout(f"PDF render exceeded {self.timeout}s")
+        record_stage("weasyprint_layout", layout_seconds)
+        record_stage("pdf_write", write_seconds)
+        # Whatever the worker did not spend rendering was spent queued or in IPC
+        record_stage("render_queue_wait", max(time.perf_counter() - start - layout_seconds - write_seconds, 0.0))
+        return pdf_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size, renders in flight and renders waiting for a free worker"""
+        running = min(self.pending, self.workers)
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "running": running,
+            "queued": self.pending - running,
+            "queue_size": self.queue_size,
+        }
+
+
+render_pool = RenderPool()
@@ -0,0 +1,238 @@
+# backend/services/sync_service.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .enhancement_service import STATUS_ENHANCED, STATUS_NO_README, enhance_user_repos
+from .github_service import GitHubError, GitHubService
+from .llm_service import DeepSeekService
+
+logger = logging.getLogger(__name__)
+
+# Per-user snapshot of the last sync. Losing it only costs one full sync.
+REPO_SNAPSHOT_PATH = os.getenv(
+    "REPO_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "codefolio-repo-snapshots.sqlite3")
+)
+
+# Enhancement results worth keeping while the README is unchanged; anything
+# else (fetch failures, LLM failures) is retried on the next sync
+REUSABLE_STATUSES = (STATUS_ENHANCED, STATUS_NO_README)
+
+
+def listing_hash(repo: Dict[str, Any]) -> str:
+    """Fingerprint of a repo as GitHub lists it, before any enhancement"""
+    canonical = json.dumps(repo, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class RepoSnapshotStore:
+    """
+    The repos each user had at their last sync, keyed by (GitHub user id,
+    repo id), with the enhanced repo as it was returned, its `pushed_at`,
+    the README blob SHA the description was generated from and a hash of
+    the listing it came from.
+    """
+
+    def __init__(self, path: str = REPO_SNAPSHOT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS repo_snapshots ("
+            "user_id TEXT NOT NULL, repo_id INTEGER NOT NULL, pushed_at TEXT, readme_sha TEXT, "
+            "listing_hash TEXT NOT NULL, repo TEXT NOT NULL, synced_at REAL NOT NULL, "
+            "PRIMARY KEY (user_id, repo_id))"
+        )
+
+    def load(self, user_id: str) -> Dict[int, Dict[str, Any]]:
+        """{repo id: {"pushed_at", "readme_sha", "listing_hash", "repo"}} for one user"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT repo_id, pushed_at, readme_sha, listing_hash, repo FROM repo_snapshots WHERE user_id = ?",
+                (user_id,),
+            ).fetchall()
+        return {
+            repo_id: {"pushed_at": pushed_at, "readme_sha": readme_sha, "listing_hash": fingerprint, "repo": json.loads(repo)}
+            for repo_id, pushed_at, readme_sha, fingerprint, repo in rows
+        }
+
+    def save(self, user_id: str, snapshots: Iterable[Dict[str, Any]]):
+        """Insert or replace snapshots shaped like load() values (plus "repo" with an "id")"""
+        now = time.time()
+        rows = [
+            (user_id, snapshot["repo"]["id"], snapshot["pushed_at"], snapshot["readme_sha"],
+             snapshot["listing_hash"], json.dumps(snapshot["repo"]), now)
+            for snapshot in snapshots
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO repo_snapshots "
+                    "(user_id, repo_id, pushed_at, readme_sha, listing_hash, repo, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, user_id: str, repo_ids: Iterable[int]):
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM repo_snapshots WHERE user_id = ? AND repo_id = ?",
+                [(user_id, repo_id) for repo_id in repo_ids],
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+snapshot_store = RepoSnapshotStore()
+
+
+def _reusable(snapshot: Optional[Dict[str, Any]]) -> bool:
+    """Whether a stored enhancement result may be served again"""
+    return snapshot is not None and snapshot["repo"].get("enhancement_status") in REUSABLE_STATUSES
+
+
+def _readme_unchanged(info: Optional[Dict[str, Any]], snapshot: Dict[str, Any]) -> bool:
+    """Whether the README the stored description came from is still the current one"""
+    if info is None:
+        return False  # Unknown: GraphQL could not tell us, the REST fallback will
+    return snapshot["readme_sha"] is not None and info["readme_sha"] == snapshot["readme_sha"]
+
+
+async def sync_user_repos(
+    authorization: str,
+    llm_service: DeepSeekService,
+    store: RepoSnapshotStore = None,
+    include_unchanged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Bring a user's repo snapshot up to date and report what changed since
+    the last sync.
+
+    The repo list itself is always fetched (cheap: unchanged pages are 304s).
+    Only repos that are new, were pushed since the snapshot, or whose last
+    enhancement failed have their README details fetched, and only those
+    whose README blob SHA actually changed go to the LLM. Metadata-only
+    changes (stars, topics, ...) keep the stored description.
+
+    Args:
+        authorization: The user's GitHub Authorization header
+        llm_service: DeepSeekService configured with the user's API key
+        store: Snapshot store (defaults to the shared SQLite store)
+        include_unchanged: Also return unchanged repos, e.g. for a client
+            that lost its local copy
+
+    Returns:
+        {"new": [repo], "changed": [repo], "deleted": [{"id", "full_name"}],
+         "unchanged": count (or [repo] with include_unchanged), "enhanced":
+         number of repos sent to the LLM, "total": repos the user has}
+
+    Raises:
+        GitHubError: if the user or their repo list cannot be fetched
+        GitHubRateLimited: if GitHub keeps refusing for rate-limit reasons
+    """
+    store = store or snapshot_store
+
+    async with GitHubService(authorization) as github:
+        user = await github.get("/user")
+        if user.status_code != 200:
+            raise GitHubError(user.status_code, "Could not identify the GitHub user")
+        user_id = str(user.json()["id"])
+
+        listing: List[Dict[str, Any]] = []
+        async for page in github.iter_pages("/user/repos"):
+            listing.extend(page)
+
+        previous = store.load(user_id)
+        fingerprints = {repo["id"]: listing_hash(repo) for repo in listing}
+
+        to_check = [
+            repo for repo in listing
+            if repo["id"] not in previous
+            or previous[repo["id"]]["pushed_at"] != repo.get("pushed_at")
+            or not _reusable(previous[repo["id"]])
+        ]
+        details = await github.fetch_repo_details([repo["full_name"] for repo in to_check]) if to_check else {}
+
+    checked = {repo["id"] for repo in to_check}
+    results: Dict[int, Dict[str, Any]] = {}
+    to_enhance = []
+    for repo in listing:
+        snapshot = previous.get(repo["id"])
+        reusable = _reusable(snapshot) and (
+            repo["id"] not in checked or _readme_unchanged(details.get(repo["full_name"]), snapshot)
+        )
+        if reusable and fingerprints[repo["id"]] == snapshot["listing_hash"]:
+            results[repo["id"]] = snapshot["repo"]
+        elif reusable:
+            stored = snapshot["repo"]
+            results[repo["id"]] = {
+                **repo,
+                "description": stored.get("description"),
+                "enhancement_status": stored.get("enhancement_status"),
+            }
+        else:
+            to_enhance.append(repo)
+
+    if to_enhance:
+        logger.info("Sync: %d/%d repos need new descriptions", len(to_enhance), len(listing))
+        for repo in await enhance_user_repos(to_enhance, authorization, llm_service, details=details):
+            results[repo["id"]] = repo
+
+    enhanced_ids = {repo["id"] for repo in to_enhance}
+    delta = {"new": [], "changed": [], "deleted": [], "unchanged": [], "enhanced": len(to_enhance), "total": len(listing)}
+    updated = []
+    for repo in listing:
+        repo_id = repo["id"]
+        snapshot = previous.get(repo_id)
+        result = results[repo_id]
+        if snapshot is None:
+            delta["new"].append(result)
+        elif result != snapshot["repo"]:
+            delta["changed"].append(result)
+        else:
+            delta["unchanged"].append(result)
+            continue
+        info = details.get(repo["full_name"])
+        if info is not None:
+            readme_sha = info["readme_sha"]
+        elif repo_id in enhanced_ids:
+            readme_sha = None  # Described from a README fetched over REST; its SHA is unknown
+        else:
+            readme_sha = snapshot["readme_sha"]
+        updated.append({
+            "repo": result,
+            "pushed_at": repo.get("pushed_at"),
+            "readme_sha": readme_sha,
+            "listing_hash": fingerprints[repo_id],
+        })
+
+    current_ids = set(fingerprints)
+    gone = [repo_id for repo_id in previous if repo_id not in current_ids]
+    delta["deleted"] = [{"id": repo_id, "full_name": previous[repo_id]["repo"].get("full_name")} for repo_id in gone]
+
+    store.save(user_id, updated)
+    store.delete(user_id, gone)
+    if not include_unchanged:
+        delta["unchanged"] = len(delta["unchanged"])
+    logger.info(
+        "Sync: %d new, %d changed, %d deleted, %d repos re-enhanced",
+        len(delta["new"]), len(delta["changed"]), len(gone), len(to_enhance),
+    )
+    return delta
@@ -0,0 +1,98 @@
+import pytest
+
+from backend.services.cache import LRUCache
+
+
+def _filled(policy: str, **kwargs) -> LRUCache:
+    cache = LRUCache(max_entries=3, policy=policy, **kwargs)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    return cache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = _filled("lru")
+    cache.get("a")
+
+    cache.set("d", "d")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats.evictions == 1
+
+
+def test_fifo_ignores_reads():
+    cache = _filled("fifo")
+    cache.get("a")
+
+    cache.set("d", "d")
+
+    assert cache.get("a") is None
+    assert [cache.get(key) for key in ("b", "c", "d")] == ["b", "c", "d"]
+
+
+def test_lfu_evicts_least_used_oldest_first():
+    cache = _filled("lfu")
+    cache.get("a")
+    cache.get("a")
+    cache.get("c")
+
+    cache.set("d", "d")
+    assert cache.get("b") is None
+
+    # d (never read) is the least used now, but the entry being stored is never the victim
+    cache.set("e", "e")
+    assert cache.get("d") is None
+    assert [cache.get(key) for key in ("a", "c", "e")] == ["a", "c", "e"]
+
+
+def test_lfu_overwrite_keeps_use_count():
+    cache = _filled("lfu")
+    cache.get("a")
+    cache.get("a")
+    cache.set("a", "a2")
+    cache.get("b")
+    cache.get("c")
+
+    cache.set("d", "d")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a2"
+
+
+def test_byte_bound_evicts_until_it_fits():
+    cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.set("a", b"xxxx")
+    cache.set("b", b"xxxx")
+
+    cache.set("c", b"xxxx")
+
+    assert cache.get("a") is None
+    assert cache.total_bytes == 8 and len(cache) == 2
+
+
+def test_value_larger_than_the_bound_is_not_stored():
+    cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.set("a", b"xxxx")
+
+    cache.set("big", b"x" * 11)
+
+    assert cache.get("big") is None
+    assert cache.get("a") == b"xxxx"
+
+
+def test_expired_entries_miss(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.services.cache.time.time", lambda: now[0])
+    cache = LRUCache(ttl=10)
+    cache.set("a", "a")
+
+    now[0] += 11
+
+    assert cache.get("a") is None
+    assert cache.stats.misses == 1 and len(cache) == 0
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        LRUCache(policy="random")
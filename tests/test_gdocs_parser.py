@@ -0,0 +1,124 @@
+import os
+
+from backend.services.gdocs_service import CVParser, GoogleDocsService
+
+SAMPLE_CV = os.path.join(os.path.dirname(__file__), "..", "backend", "benchmarks", "corpus", "sample_cv.txt")
+
+
+def _without_item_ids(parsed):
+    """Education/experience item ids come from id(), so they are not stable across runs"""
+    for section in parsed["sections"]:
+        for item in section["items"]:
+            if section["title"] != "Skills":
+                item.pop("id")
+    return parsed
+
+
+def _skills(*names):
+    return [
+        {"id": f"item_{index}", "primary": name, "secondary": "", "timeline": "", "description": ""}
+        for index, name in enumerate(names, start=1)
+    ]
+
+
+def test_sample_cv():
+    with open(SAMPLE_CV, encoding="utf-8") as f:
+        parsed = _without_item_ids(GoogleDocsService.parse_cv_content(f.read()))
+
+    assert parsed == {
+        "user_details": {
+            "name": "Jane Doe",
+            "email": "jane.doe@example.com",
+            "phone": "+44 20 7946 0958",
+            "linkedin": "https://linkedin.com/in/janedoe",
+            "github_username": "janedoe",
+            "job_title": "Senior Software Engineer",
+        },
+        "sections": [
+            {
+                "id": "sec_1",
+                "title": "Educational Qualifications",
+                "items": [
+                    {"primary": "University of Cambridge", "secondary": "MSc Computer Science",
+                     "timeline": "2014-2015", "description": "Distributed systems and databases"},
+                    {"primary": "University of Leeds", "secondary": "BSc Computer Science",
+                     "timeline": "2011-2014", "description": "First class honours"},
+                ],
+            },
+            {
+                "id": "sec_2",
+                "title": "Employment History",
+                "items": [
+                    {"primary": "Acme Ltd", "secondary": "Senior Software Engineer", "timeline": "2019-Present",
+                     "description": "Led the payments platform rewrite, cutting p99 latency by 60%"},
+                    {"primary": "Globex", "secondary": "Software Engineer", "timeline": "2015-2019",
+                     "description": "Built data pipelines processing 2TB a day"},
+                ],
+            },
+            {
+                "id": "sec_3",
+                "title": "Skills",
+                "items": _skills("Python", "Go", "TypeScript", "PostgreSQL", "Kafka", "Docker", "Kubernetes", "Terraform"),
+            },
+        ],
+    }
+
+
+def test_streaming_matches_whole_document():
+    with open(SAMPLE_CV, encoding="utf-8") as f:
+        content = f.read()
+    parser = CVParser()
+    for line in content.splitlines(keepends=True):
+        parser.feed(line)
+
+    assert _without_item_ids(parser.result()) == _without_item_ids(GoogleDocsService.parse_cv_content(content))
+
+
+def test_skills_before_other_sections_are_kept():
+    parsed = GoogleDocsService.parse_cv_content(
+        "SKILLS\n"
+        "- Python, Go\n"
+        "EXPERIENCE\n"
+        "- Acme | Engineer | 2020-Present | Payments\n"
+    )
+
+    assert [section["title"] for section in parsed["sections"]] == ["Skills", "Employment History"]
+    assert parsed["sections"][0]["items"] == _skills("Python", "Go")
+
+
+def test_section_followed_by_personal_info_is_kept():
+    parsed = GoogleDocsService.parse_cv_content(
+        "EDUCATION\n"
+        "- Leeds | BSc | 2011-2014\n"
+        "CONTACT\n"
+        "Name: Jane Doe\n"
+    )
+
+    assert [section["title"] for section in parsed["sections"]] == ["Educational Qualifications"]
+    assert parsed["user_details"] == {"name": "Jane Doe"}
+
+
+def test_repeated_section_is_emitted_twice():
+    parsed = GoogleDocsService.parse_cv_content(
+        "EXPERIENCE\n"
+        "- Acme | Engineer | 2020-Present\n"
+        "SKILLS\n"
+        "- Python\n"
+        "WORK\n"
+        "- Globex | Engineer | 2015-2019\n"
+    )
+
+    assert [(section["id"], section["title"]) for section in parsed["sections"]] == [
+        ("sec_1", "Employment History"),
+        ("sec_2", "Skills"),
+        ("sec_3", "Employment History"),
+    ]
+
+
+def test_header_with_several_keywords_uses_first_table_row():
+    parsed = GoogleDocsService.parse_cv_content(
+        "WORK EXPERIENCE AND SKILLS\n"
+        "- Acme | Engineer | 2020-Present\n"
+    )
+
+    assert [section["title"] for section in parsed["sections"]] == ["Employment History"]
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.services import github_rate_limiter
+from backend.services.github_rate_limiter import (
+    GITHUB_MAX_CONCURRENT_PER_TOKEN,
+    GitHubRateLimited,
+    GitHubRateLimiter,
+    TokenBudget,
+)
+
+
+def _paced_budget(now: float, interval: float) -> TokenBudget:
+    """A budget whose remaining requests are spread `interval` seconds apart"""
+    budget = TokenBudget.__new__(TokenBudget)  # No semaphore needed outside an event loop
+    budget.remaining = 10
+    budget.reset_at = now + 10 * interval
+    budget.blocked_until = 0.0
+    budget.next_slot = 0.0
+    budget.min_interval = 0.0
+    return budget
+
+
+def _response(status: int, remaining: int = 10, reset_in: float = 1000, **headers) -> httpx.Response:
+    return httpx.Response(status, headers={
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-reset": str(time.time() + reset_in),
+        **headers,
+    })
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def sleep(_):
+        pass
+
+    monkeypatch.setattr(github_rate_limiter.asyncio, "sleep", sleep)
+
+
+def test_burst_runs_ahead_of_the_schedule():
+    now = 1000.0
+    budget = _paced_budget(now, interval=100.0)
+
+    waits = [budget.reserve(now, max_wait=1e9)[0] for _ in range(GITHUB_MAX_CONCURRENT_PER_TOKEN + 1)]
+
+    assert waits[:GITHUB_MAX_CONCURRENT_PER_TOKEN] == [0.0] * GITHUB_MAX_CONCURRENT_PER_TOKEN
+    assert waits[-1] == 100.0
+
+
+def test_refused_requests_do_not_advance_the_schedule():
+    now = 1000.0
+    budget = _paced_budget(now, interval=100.0)
+    for _ in range(GITHUB_MAX_CONCURRENT_PER_TOKEN):
+        budget.reserve(now, max_wait=60)
+    next_slot = budget.next_slot
+
+    for _ in range(10):
+        wait, interval = budget.reserve(now, max_wait=60)
+        assert wait > 60 and interval == 0.0
+
+    assert budget.next_slot == next_slot
+
+
+def test_blocked_token_is_refused_without_reserving():
+    now = 1000.0
+    budget = _paced_budget(now, interval=1.0)
+    budget.blocked_until = now + 120
+
+    assert budget.reserve(now, max_wait=60) == (120.0, 0.0)
+    assert budget.next_slot == 0.0
+
+
+def test_not_modified_responses_give_their_slot_back(no_sleep):
+    limiter = GitHubRateLimiter()
+
+    async def run():
+        budget = limiter.budget("token")
+
+        async def not_modified():
+            return _response(304, remaining=100, reset_in=1000)
+
+        for _ in range(50):
+            await limiter.send("token", not_modified)
+        return budget
+
+    budget = asyncio.run(run())
+
+    # 50 paced requests would have pushed the schedule ~500s ahead
+    assert budget.next_slot <= time.time()
+
+
+def test_counted_responses_advance_the_schedule(no_sleep):
+    limiter = GitHubRateLimiter()
+
+    async def run():
+        budget = limiter.budget("token")
+
+        async def ok():
+            return _response(200, remaining=100, reset_in=1000)
+
+        # ~10s apart: 20 requests stay within GITHUB_MAX_WAIT of the burst
+        for _ in range(20):
+            await limiter.send("token", ok)
+        return budget
+
+    budget = asyncio.run(run())
+
+    assert budget.next_slot > time.time() + 150
+
+
+def test_retry_after_beyond_max_wait_raises(no_sleep):
+    limiter = GitHubRateLimiter()
+    calls = []
+
+    async def rate_limited():
+        calls.append(1)
+        return _response(403, remaining=0, reset_in=3600, **{"retry-after": "3600"})
+
+    with pytest.raises(GitHubRateLimited) as raised:
+        asyncio.run(limiter.send("token", rate_limited))
+
+    # The first answer blocks the token; the retry is refused before it is sent
+    assert len(calls) == 1
+    assert raised.value.retry_after > 3000
+
+
+def test_server_errors_are_retried(no_sleep):
+    limiter = GitHubRateLimiter()
+    responses = [_response(502), _response(503), _response(200)]
+
+    async def flaky():
+        return responses.pop(0)
+
+    response = asyncio.run(limiter.send("token", flaky))
+
+    assert response.status_code == 200
+    assert responses == []
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import re
+
+from backend.services.cache import LRUCache, TieredCache
+from backend.services.llm_providers import Completion, LLMRequestRejected
+from backend.services.llm_service import DeepSeekService, _parse_batch_output
+
+_REPO_RE = re.compile(r'^### Repository (\d+): "([^"]+)"', re.M)
+
+
+class ScriptedProvider:
+    """
+    Answers batch prompts with `answer(ids_and_names)`, which returns a
+    Completion or raises; single prompts get "<name> single"
+    """
+
+    name = "scripted"
+    model = "scripted-1"
+
+    def __init__(self, answer=None):
+        self.answer = answer or (lambda repos: _batch_answer(repos))
+        self.batches = []
+        self.singles = []
+
+    async def complete(self, messages, max_tokens, temperature, json_output=False):
+        prompt = messages[-1]["content"]
+        if json_output:
+            repos = [(int(number), name) for number, name in _REPO_RE.findall(prompt)]
+            self.batches.append([name for _, name in repos])
+            return self.answer(repos)
+        name = re.search(r'"([^"]+)"', prompt).group(1)
+        self.singles.append(name)
+        return Completion(f"{name} single", "stop", self.name)
+
+
+def _batch_answer(repos, finish_reason="stop"):
+    descriptions = [{"id": number, "description": f"{name} batched"} for number, name in repos]
+    return Completion(json.dumps({"descriptions": descriptions}), finish_reason, "scripted")
+
+
+def _service(provider, batch_size=4):
+    return DeepSeekService(provider=provider, batch_size=batch_size, cache=TieredCache(LRUCache()))
+
+
+def _describe_all(service, names):
+    async def run():
+        return await asyncio.gather(
+            *(service.generate_project_description(f"# {name}\nA tool called {name}.", name) for name in names)
+        )
+
+    return asyncio.run(run())
+
+
+def test_parse_batch_output():
+    content = json.dumps({"descriptions": [
+        {"id": 1, "description": '"This project syncs files."'},
+        {"id": "2", "description": "Second"},
+        {"id": 3, "description": ""},
+        {"id": 9, "description": "Out of range"},
+        {"description": "No id"},
+        "not an entry",
+    ]})
+
+    assert _parse_batch_output(content, 3) == {1: "Syncs files.", 2: "Second"}
+
+
+def test_parse_batch_output_accepts_a_bare_list():
+    assert _parse_batch_output('[{"id": 1, "description": "One"}]', 1) == {1: "One"}
+
+
+def test_parse_batch_output_rejects_malformed_json():
+    assert _parse_batch_output("Sure! Here are the descriptions:", 2) == {}
+    assert _parse_batch_output('{"descriptions": "none"}', 2) == {}
+
+
+def test_concurrent_calls_share_one_request():
+    provider = ScriptedProvider()
+
+    results = _describe_all(_service(provider), ["a", "b", "c", "d"])
+
+    assert results == ["a batched", "b batched", "c batched", "d batched"]
+    assert provider.batches == [["a", "b", "c", "d"]] and provider.singles == []
+
+
+def test_repos_missing_from_the_answer_are_described_one_by_one():
+    provider = ScriptedProvider(lambda repos: _batch_answer(repos[:2]))
+
+    results = _describe_all(_service(provider), ["a", "b", "c", "d"])
+
+    assert results == ["a batched", "b batched", "c single", "d single"]
+    assert sorted(provider.singles) == ["c", "d"]
+
+
+def test_truncated_answer_splits_the_batch():
+    def answer(repos):
+        return _batch_answer(repos, finish_reason="length" if len(repos) > 2 else "stop")
+
+    provider = ScriptedProvider(answer)
+
+    results = _describe_all(_service(provider), ["a", "b", "c", "d"])
+
+    assert results == ["a batched", "b batched", "c batched", "d batched"]
+    assert provider.batches == [["a", "b", "c", "d"], ["a", "b"], ["c", "d"]]
+
+
+def test_rejected_batch_splits_down_to_single_requests():
+    def answer(repos):
+        raise LLMRequestRejected("context length exceeded")
+
+    provider = ScriptedProvider(answer)
+
+    results = _describe_all(_service(provider, batch_size=2), ["a", "b"])
+
+    assert results == ["a single", "b single"]
+
+
+def test_batched_descriptions_are_cached():
+    provider = ScriptedProvider()
+    service = _service(provider)
+    _describe_all(service, ["a", "b"])
+
+    results = _describe_all(service, ["a", "b"])
+
+    assert results == ["a batched", "b batched"]
+    assert len(provider.batches) == 1
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from backend.services import llm_providers
+from backend.services.llm_providers import Completion, LLMRequestRejected, LLMRouter
+
+MESSAGES = [{"role": "user", "content": "Describe this repo"}]
+
+
+class FakeProvider:
+    """Answers after `delay` seconds, or raises `error` after it"""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.model = f"{name}-1"
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def complete(self, messages, max_tokens, temperature, json_output=False):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return Completion(f"from {self.name}", "stop", self.name)
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    stats = {}
+    monkeypatch.setattr(llm_providers, "provider_stats", stats)
+    return stats
+
+
+def _complete(router):
+    return asyncio.run(router.complete(MESSAGES, 100, 0.7))
+
+
+def test_fast_primary_is_not_hedged(stats):
+    primary, secondary = FakeProvider("primary", 0.01), FakeProvider("secondary")
+
+    completion = _complete(LLMRouter([primary, secondary], hedge_after="0.2"))
+
+    assert completion.provider == "primary"
+    assert secondary.calls == 0
+    assert stats["primary"].requests == 1
+
+
+def test_slow_primary_is_hedged_and_the_loser_records_its_latency(stats):
+    primary, secondary = FakeProvider("primary", 1.0), FakeProvider("secondary", 0.01)
+
+    async def run():
+        completion = await LLMRouter([primary, secondary], hedge_after="0.05").complete(MESSAGES, 100, 0.7)
+        await asyncio.sleep(0.01)  # Let the cancelled primary unwind
+        return completion
+
+    completion = asyncio.run(run())
+
+    assert completion.provider == "secondary"
+    assert stats["secondary"].hedges == 1 and stats["secondary"].hedge_wins == 1
+    # The loser was cancelled by the router: counted as at least this slow, not as an error
+    assert stats["primary"].requests == 1 and stats["primary"].errors == 0
+    assert stats["primary"].latency >= 0.05
+
+
+def test_failed_primary_falls_over(stats):
+    primary = FakeProvider("primary", error=RuntimeError("502 from upstream"))
+    secondary = FakeProvider("secondary")
+
+    completion = _complete(LLMRouter([primary, secondary], hedge_after="1"))
+
+    assert completion.provider == "secondary"
+    assert stats["primary"].errors == 1
+
+
+def test_rejected_request_is_not_retried_elsewhere(stats):
+    primary = FakeProvider("primary", error=LLMRequestRejected("context length exceeded"))
+    secondary = FakeProvider("secondary")
+
+    with pytest.raises(LLMRequestRejected):
+        _complete(LLMRouter([primary, secondary], hedge_after="1"))
+
+    assert secondary.calls == 0
+    assert "primary" not in stats or stats["primary"].errors == 0
+
+
+def test_error_from_both_providers_is_raised(stats):
+    primary = FakeProvider("primary", 0.1, error=RuntimeError("primary down"))
+    secondary = FakeProvider("secondary", 0.1, error=RuntimeError("secondary down"))
+
+    with pytest.raises(RuntimeError):
+        _complete(LLMRouter([primary, secondary], hedge_after="0.01"))
+
+    assert stats["primary"].errors == 1 and stats["secondary"].errors == 1
+
+
+def test_outer_cancellation_is_not_recorded(stats):
+    primary, secondary = FakeProvider("primary", 1.0), FakeProvider("secondary", 1.0)
+
+    async def run():
+        task = asyncio.create_task(LLMRouter([primary, secondary], hedge_after="0.01").complete(MESSAGES, 100, 0.7))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    assert secondary.calls == 1
+    assert all(provider_stats.requests == 0 for provider_stats in stats.values())
+
+
+def test_ranking_prefers_lower_latency(stats):
+    slow, fast = FakeProvider("slow"), FakeProvider("fast")
+    router = LLMRouter([slow, fast])
+    llm_providers._stats_for(slow).record(2.0, ok=True)
+    llm_providers._stats_for(fast).record(0.2, ok=True)
+
+    assert [provider.name for provider in router.rank()] == ["fast", "slow"]
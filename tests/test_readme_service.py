@@ -0,0 +1,35 @@
+from backend.services.readme_service import condense_readme, strip_markdown_noise
+
+
+def test_identifiers_survive():
+    text = "Uses create_react_app, node_modules and my_pkg.__init__ plus 2*3*4 and __init__.py"
+
+    assert strip_markdown_noise(text) == text
+
+
+def test_inline_code_identifiers_survive():
+    assert strip_markdown_noise("Call `load_config()` from `app/__main__.py`") == "Call load_config() from app/__main__.py"
+
+
+def test_emphasis_is_stripped():
+    text = "A **fast** and *small* tool, _really easy to use_, __no setup needed__ and ~~slow~~ quick"
+
+    assert strip_markdown_noise(text) == "A fast and small tool, really easy to use, no setup needed and slow quick"
+
+
+def test_code_only_readme_falls_back_to_raw_text():
+    readme = "```python\nimport foo\nfoo.run()\n```\n"
+
+    assert condense_readme(readme) == readme.strip()
+
+
+def test_badge_only_readme_falls_back_to_raw_text():
+    readme = "[![CI](https://example.com/badge.svg)](https://example.com)"
+
+    assert condense_readme(readme) == readme
+
+
+def test_noise_sections_are_dropped():
+    readme = "# my_tool\nA CLI that syncs dotfiles.\n\n## License\nMIT\n"
+
+    assert condense_readme(readme) == "my_tool\nA CLI that syncs dotfiles."
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from backend.benchmarks.fakes import fake_repo
+from backend.services import sync_service
+from backend.services.enhancement_service import STATUS_ENHANCED, STATUS_LLM_FAILED
+from backend.services.github_service import GitHubResponse
+from backend.services.sync_service import RepoSnapshotStore, sync_user_repos
+
+
+class FakeGitHub:
+    """Stands in for GitHubService: serves `repos` and README SHAs from `readme_shas`"""
+
+    repos = {}
+    readme_shas = {}
+    details_requested = []
+
+    def __init__(self, authorization):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def get(self, path):
+        return GitHubResponse(200, {}, '{"id": 42}')
+
+    async def iter_pages(self, path):
+        yield [dict(repo) for repo in self.repos.values()]
+
+    async def fetch_repo_details(self, full_names):
+        FakeGitHub.details_requested.extend(full_names)
+        return {
+            name: {"readme": f"README {self.readme_shas[name]}", "readme_sha": self.readme_shas[name],
+                   "description": None, "language": None, "topics": []}
+            for name in full_names
+        }
+
+
+@pytest.fixture
+def github(monkeypatch):
+    FakeGitHub.repos = {index: fake_repo("u", index) for index in range(1, 5)}
+    FakeGitHub.readme_shas = {repo["full_name"]: "sha-1" for repo in FakeGitHub.repos.values()}
+    FakeGitHub.details_requested = []
+    monkeypatch.setattr(sync_service, "GitHubService", FakeGitHub)
+    return FakeGitHub
+
+
+@pytest.fixture
+def failing():
+    """Names of repos whose enhancement fails"""
+    return set()
+
+
+@pytest.fixture
+def enhanced(monkeypatch, failing):
+    """Records the names of the repos sent to the LLM"""
+    sent = []
+
+    async def enhance_user_repos(repos, authorization, llm_service, details=None):
+        sent.extend(repo["name"] for repo in repos)
+        return [
+            {**repo, "description": None, "enhancement_status": STATUS_LLM_FAILED} if repo["name"] in failing
+            else {**repo, "description": f"{repo['name']} from {details[repo['full_name']]['readme']}",
+                  "enhancement_status": STATUS_ENHANCED}
+            for repo in repos
+        ]
+
+    monkeypatch.setattr(sync_service, "enhance_user_repos", enhance_user_repos)
+    return sent
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RepoSnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    yield store
+    store.close()
+
+
+def _sync(store, **kwargs):
+    return asyncio.run(sync_user_repos("token x", llm_service=None, store=store, **kwargs))
+
+
+def _names(repos):
+    return sorted(repo["name"] for repo in repos)
+
+
+def test_first_sync_reports_every_repo_as_new(github, enhanced, store):
+    delta = _sync(store)
+
+    assert _names(delta["new"]) == ["project-1", "project-2", "project-3", "project-4"]
+    assert delta["changed"] == [] and delta["deleted"] == []
+    assert delta["unchanged"] == 0 and delta["enhanced"] == 4 and delta["total"] == 4
+
+
+def test_nothing_changed(github, enhanced, store):
+    _sync(store)
+    enhanced.clear()
+    github.details_requested.clear()
+
+    delta = _sync(store)
+
+    assert delta["new"] == [] and delta["changed"] == [] and delta["deleted"] == []
+    assert delta["unchanged"] == 4
+    assert enhanced == [] and github.details_requested == []
+
+
+def test_changes_are_classified(github, enhanced, store):
+    _sync(store)
+    enhanced.clear()
+    github.details_requested.clear()
+
+    github.repos[1]["stargazers_count"] += 10  # Metadata only
+    github.repos[2]["pushed_at"] = "2026-01-01T00:00:00Z"  # Pushed, same README
+    github.repos[3]["pushed_at"] = "2026-01-01T00:00:00Z"  # Pushed, new README
+    github.readme_shas["u/project-3"] = "sha-2"
+    del github.repos[4]
+    github.repos[5] = fake_repo("u", 5)
+    github.readme_shas["u/project-5"] = "sha-1"
+
+    delta = _sync(store)
+
+    assert _names(delta["new"]) == ["project-5"]
+    assert _names(delta["changed"]) == ["project-1", "project-2", "project-3"]
+    assert delta["deleted"] == [{"id": 4, "full_name": "u/project-4"}]
+    assert delta["unchanged"] == 0
+    # Only pushed or new repos have their README checked, only new READMEs go to the LLM
+    assert sorted(github.details_requested) == ["u/project-2", "u/project-3", "u/project-5"]
+    assert sorted(enhanced) == ["project-3", "project-5"]
+
+    changed = {repo["name"]: repo for repo in delta["changed"]}
+    assert changed["project-1"]["stargazers_count"] == github.repos[1]["stargazers_count"]
+    assert changed["project-1"]["description"] == "project-1 from README sha-1"
+    assert changed["project-2"]["description"] == "project-2 from README sha-1"
+    assert changed["project-3"]["description"] == "project-3 from README sha-2"
+    assert 4 not in store.load("42")
+
+
+def test_failed_enhancements_are_retried(github, enhanced, failing, store):
+    failing.add("project-2")
+    _sync(store)
+    enhanced.clear()
+    failing.clear()
+
+    delta = _sync(store)
+
+    assert enhanced == ["project-2"]
+    assert _names(delta["changed"]) == ["project-2"]
+    assert delta["changed"][0]["enhancement_status"] == STATUS_ENHANCED
+
+
+def test_include_unchanged_returns_the_repos(github, enhanced, store):
+    _sync(store)
+
+    delta = _sync(store, include_unchanged=True)
+
+    assert _names(delta["unchanged"]) == ["project-1", "project-2", "project-3", "project-4"]